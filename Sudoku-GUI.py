@@ -3,7 +3,11 @@
 # from sudokutools import valid, solve, find_empty, generate_board
 import sudokutools
 import optimized_backtracking as ob
-from copy import deepcopy
+import puzzle_pool
+import search
+from board_state import BoardState
+from flat_board import SYMBOLS, copy_board
+from solve_stats import SolveStats
 from sys import exit
 import pygame
 import time
@@ -12,9 +16,16 @@ import math
 
 pygame.init()
 
+# Prikaz za svaku veličinu ploče: (veličina polja u px, veličina fonta, pomak vrijednosti unutar polja, prozor).
+# Blok je size polja, pa su linije blokova na svakih size * veličina polja piksela.
+LAYOUT = {3: (60, 45, (21, 16), (550, 590)),
+          4: (45, 30, (17, 14), (720, 760)),
+          5: (30, 22, (9, 6), (750, 790)),
+          6: (22, 17, (6, 4), (792, 832))}
+
 
 class Board:
-    def __init__(self, window, size=3, difficulty=0):
+    def __init__(self, window, size=3, difficulty=0, puzzle=None):
         """
         Inicijalizacija Board objekta.
 
@@ -22,30 +33,39 @@ class Board:
             window: Pygame Window objekat.
             size int: Veličina ploče.
             difficulty int: Težina ploče.
+            puzzle tuple: Par (slagalica, rješenje) iz puzzle_pool-a; ako je None slagalica se generiše i rješava.
         """
         # Generiši novu ploču i kreiraj urađenu ploču za tu ploču
         self.size = size
         self.difficulty = difficulty
-        self.board = sudokutools.generate_board(self.size, self.difficulty)
+        self.cache = None
+        if puzzle is not None:
+            self.board, self.solvedBoard = puzzle
+        else:
+            self.board = sudokutools.generate_board(self.size, self.difficulty, unique=True)  # unos se poredi sa
+            # solvedBoard, pa slagalica mora imati samo jedno rješenje
+            self.solvedBoard = copy_board(self.board)
+            self.cache = ob.cache_valid_values(self.board, self.size)
+            stats = SolveStats()
+            ob.solve_with_cache(self.solvedBoard, self.cache, self.size, propagate=True, stats=stats)
+            print(stats)
         sudokutools.print_board(self.board, self.size)
-        self.solvedBoard = deepcopy(self.board)
-        self.cache = ob.cache_valid_values(self.board, self.size)
+        if self.cache is None:
+            self.cache = ob.cache_valid_values(self.board, self.size)
         # self.ordered_cache = ob.orded_valid_values(self.board, self.cache)  # kada bismo ovo uradili vec bi nam upisao
         # vrijednosti bez vizuelizacije
-        self.ordered_cache = deepcopy(self.cache)
-        # sudokutools.print_board(self.board)
-        stari_broj = ob.broj_pokusaja
-        ob.solve_with_cache(self.solvedBoard, self.ordered_cache, self.size)
-        print(ob.broj_pokusaja - stari_broj)
+        self.ordered_cache = self.cache  # solve_with_cache keš samo čita, živi kandidati se vode u stanju ploče
         # sudokutools.print_board(self.solvedBoard)
 
         # Create a 2D list of Tile objects to represent the Sudoku board.
         self.window = window
 
-        self.size_board = lambda s: 540 if s == 3 else (720 if s == 4 else 0)  # lambda fija za izracuvanje ukupnih
+        self.size_board = lambda s: LAYOUT[s][0] * s**2  # lambda fija za izracuvanje ukupnih
         # dinamicke dimenzija ploce za prikaz
-        self.size_tile = lambda s: 60 if s == 3 else (45 if s == 4 else 0)
+        self.size_tile = lambda s: LAYOUT[s][0]
         # dinamicke dimenzija polja za prikaz
+        self.size_block = lambda s: LAYOUT[s][0] * s  # razmak linija blokova (3*60, 4*45, 5*30, 6*22)
+        self.text_offset = LAYOUT[self.size][2]  # pomak vrijednosti od gornjeg-lijevog ćoška polja
 
         self.tiles = [
             [Tile(self.board[i][j], window, i * self.size_tile(self.size), j * self.size_tile(self.size), self.size)
@@ -65,9 +85,9 @@ class Board:
                     pygame.draw.line(
                         self.window,
                         (0, 0, 0),
-                        (j // self.size * 180, 0),  # proprati brojeve moras paziti velicinu tile da onda ide
-                        # size puta to
-                        (j // self.size * 180, self.size_board(self.size)),
+                        (j // self.size * self.size_block(self.size), 0),  # proprati brojeve moras paziti
+                        # velicinu tile da onda ide size puta to
+                        (j // self.size * self.size_block(self.size), self.size_board(self.size)),
                         4,
                     )
                 # Crtanje horizontalne linije na svakom trećem redu.
@@ -75,8 +95,8 @@ class Board:
                     pygame.draw.line(
                         self.window,
                         (0, 0, 0),
-                        (0, i // self.size * 180),  # u oba slucaja je 180 jer je 3*60, a i 4*45 je isto 180
-                        (self.size_board(self.size), i // self.size * 180),
+                        (0, i // self.size * self.size_block(self.size)),
+                        (self.size_board(self.size), i // self.size * self.size_block(self.size)),
                         # poziv preko lambda fije
                         4,
                     )
@@ -86,17 +106,15 @@ class Board:
                 # Prikaži vrijednost Tile objekta ako je ona različita od 0.
                 if self.tiles[i][j].value != 0:
                     self.tiles[i][j].display(
-                        self.tiles[i][j].value, ((17 if self.size == 4 else (21 if self.size == 3 else 0))
-                                                 + j * self.size_tile(self.size),
-                                                 (16 if self.size == 3 else (14 if self.size == 4 else 0))
-                                                 + i * self.size_tile(self.size)), (0, 0, 0)
+                        self.tiles[i][j].value, (self.text_offset[0] + j * self.size_tile(self.size),
+                                                 self.text_offset[1] + i * self.size_tile(self.size)), (0, 0, 0)
                     )
         # Crtanje horizontalne linije na dnu ploče.
         pygame.draw.line(
             self.window,
             (0, 0, 0),
-            (0, (i + 1) // self.size * 180),
-            (self.size_board(self.size), (i + 1) // self.size * 180),
+            (0, (i + 1) // self.size * self.size_block(self.size)),
+            (self.size_board(self.size), (i + 1) // self.size * self.size_block(self.size)),
             4,
         )
 
@@ -150,7 +168,8 @@ class Board:
                 # prikaz vrijednosti koje korisnik unese pri unosu; drugačije boje radi lakšeg raspoznavanja
                 self.tiles[value[0]][value[1]].display(
                     keys[value],
-                    (21 + value[0] * self.size_tile(self.size), 16 + value[1] * self.size_tile(self.size)),
+                    (self.text_offset[0] + value[0] * self.size_tile(self.size),
+                     self.text_offset[1] + value[1] * self.size_tile(self.size)),
                     (128, 128, 128),
                 )
 
@@ -176,7 +195,7 @@ class Board:
         Returns:
             None
         """
-        board_old = deepcopy(self.board)
+        board_old = copy_board(self.board)
         self.ordered_cache = ob.orded_valid_values(self.board, self.cache, self.size)
         # sudokutools.print_board(board_old, self.size)
         # sudokutools.print_board(self.board, self.size)
@@ -207,8 +226,11 @@ class Board:
 
     def visualSolve(self, wrong, time):
         """
-       Rekurzivno rješavanje ploče uz vizuelnu podršku, kao i prikaz polja koja su ispravna, odnosno neispravna sa
-       odgovarajućim bojama okvira ćelije.
+       Rješavanje ploče uz vizuelnu podršku, kao i prikaz polja koja su ispravna, odnosno neispravna sa
+       odgovarajućim bojama okvira ćelije. Pretraga je iterativna (search.steps) i vraća se nakon svakog koraka, pa se
+       svaki korak iscrta bez rekurzije, i za ploče svih veličina. Ploče 25x25 i 36x36 se rješavaju sa MRV izborom
+       polja i propagacijom (red po red bi pretraga trajala predugo), pa se nakon svakog koraka prikazuju i polja koja
+       je popunila propagacija.
         Args:
             wrong (int): Trenutni broj neispravnih pokušaja.
             time (int): Trentutno proteklo vrijeme.
@@ -216,37 +238,38 @@ class Board:
         Returns:
             bool: True if the board is successfully solved, False otherwise.
         """
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                exit()  # exit the game if the user clicks the close button
-
-        empty = sudokutools.find_empty(self.board, self.size)
-        if not empty:
-            return True  # the board is solved if there are no empty tiles left
-
-        for nums in range(self.size**2):
-            if sudokutools.valid(self.board, (empty[0], empty[1]), nums + 1, self.size):
-                # fill in the current empty tile with a valid number
-                self.board[empty[0]][empty[1]] = nums + 1
-                self.tiles[empty[0]][empty[1]].value = nums + 1
-                self.tiles[empty[0]][empty[1]].correct = True
-                pygame.time.delay(63)  # delay to slow down the solving animation
-                self.redraw(
-                    {}, wrong, time
-                )  # redraw the game window with the updated board
-
-                if self.visualSolve(wrong, time):
-                    return True  # recursively solve the rest of the board if the current move is valid
-
+        large = self.size >= 5
+        state = BoardState(self.board, self.size, mrv=large)
+        if not state.consistent:
+            return False
+        next_cell = search.mrv if large else search.row_major
+        for event, idx, value in search.steps(state, next_cell, search.ascending, propagate=large):
+            for pygame_event in pygame.event.get():
+                if pygame_event.type == pygame.QUIT:
+                    exit()  # exit the game if the user clicks the close button
+            if large:
+                for i in range(self.size**2):
+                    for j in range(self.size**2):
+                        self.tiles[i][j].value = self.board[i][j]  # polja koja je upisala (ili poništila) propagacija
+            if event == search.SOLVED:
+                return True  # the board is solved if there are no empty tiles left
+
+            tile = self.tiles[idx // self.size**2][idx % self.size**2]
+            if event == search.PLACE:
+                # fill in the current empty tile with a valid number (state je već upisao vrijednost u self.board)
+                tile.value = value
+                tile.correct = True
+                tile.incorrect = False
+            else:
                 # if the current move is not valid, reset the tile and highlight it as incorrect
-                self.board[empty[0]][empty[1]] = 0
-                self.tiles[empty[0]][empty[1]].value = 0
-                self.tiles[empty[0]][empty[1]].incorrect = True
-                self.tiles[empty[0]][empty[1]].correct = False
-                pygame.time.delay(63)  # delay to slow down the solving animation
-                self.redraw(
-                    {}, wrong, time
-                )  # redraw the game window with the updated board
+                tile.value = 0
+                tile.incorrect = True
+                tile.correct = False
+            pygame.time.delay(63)  # delay to slow down the solving animation
+            self.redraw(
+                {}, wrong, time
+            )  # redraw the game window with the updated board
+        return False
 
     def hint(self, keys):
         """
@@ -302,8 +325,7 @@ class Tile:
         self.value = value
         self.window = window
         self.size = size
-        self.rect = pygame.Rect(x1, y1, 60 if self.size == 3 else (45 if self.size == 4 else 0),
-                                60 if self.size == 3 else (45 if self.size == 4 else 0))
+        self.rect = pygame.Rect(x1, y1, LAYOUT[self.size][0], LAYOUT[self.size][0])
         self.selected = False
         self.correct = False
         self.incorrect = False
@@ -330,8 +352,8 @@ class Tile:
         color,
     ):
         """
-        Metoda za prikaz vrijednosti polja u sredini celije. U slucaju 16x16 slagalica i dvocifrenih brojeva 10-16,
-        prikazuju se odgovarajuci ekvivalenti u vidu karaktera.
+        Metoda za prikaz vrijednosti polja u sredini celije. Dvocifreni brojevi 10-36 (16x16 i veće slagalice)
+        prikazuju se odgovarajucim karakterima iz flat_board.SYMBOLS (A-Z, pa '@').
 
         Args:
             value (int): Vrijednost koja se prikazuje.
@@ -342,21 +364,8 @@ class Tile:
             None.
         """
 
-        double_digit_numbers = [10, 11, 12, 13, 14, 15, 16]
-        value_to_letter = {
-            10: "A",
-            11: "B",
-            12: "C",
-            13: "D",
-            14: "E",
-            15: "F",
-            16: "G"
-        }
-        font = pygame.font.SysFont("lato", 45 if self.size == 3 else (30 if self.size == 4 else 0))
-        if value not in double_digit_numbers:
-            text = font.render(str(value), True, color)
-        else:
-            text = font.render(str(value_to_letter.get(value, "Na")), True, color)
+        font = pygame.font.SysFont("lato", LAYOUT[self.size][1])
+        text = font.render(SYMBOLS[value - 1] if 0 < value <= len(SYMBOLS) else "Na", True, color)
         self.window.blit(text, position)
 
     def clicked(self, mousePos):
@@ -473,28 +482,29 @@ class RadioButton:
 
 def main_display(size=3, difficulty=0):
     # Set up the pygame window
-    screen = pygame.display.set_mode((550, 590))
-    if size == 4:
-        screen = pygame.display.set_mode((720, 760))
+    screen = pygame.display.set_mode(LAYOUT[size][3])
 
     screen.fill((255, 255, 255))
     pygame.display.set_caption("Sudoku Solver")
     icon = pygame.image.load("assets/thumbnail.png")
     pygame.display.set_icon(icon)
 
-    # Display "Generating Random Grid" text while generating a random grid
-    font = pygame.font.SysFont("Bahnschrift", 40)
-    text = font.render("Generating", True, (0, 0, 0))
-    screen.blit(text, (175, 245))
+    # slagalica se uzima iz pool-a koji se dopunjava u pozadini; generiše se na licu mjesta samo ako je pool prazan
+    puzzle = puzzle_pool.pop_puzzle(size, difficulty)
+    if puzzle is None:
+        # Display "Generating Random Grid" text while generating a random grid
+        font = pygame.font.SysFont("Bahnschrift", 40)
+        text = font.render("Generating", True, (0, 0, 0))
+        screen.blit(text, (175, 245))
 
-    font = pygame.font.SysFont("Bahnschrift", 40)
-    text = font.render("Random Grid", True, (0, 0, 0))
-    screen.blit(text, (156, 290))
-    pygame.display.flip()
-    pygame.time.delay(1000)
+        font = pygame.font.SysFont("Bahnschrift", 40)
+        text = font.render("Random Grid", True, (0, 0, 0))
+        screen.blit(text, (156, 290))
+        pygame.display.flip()
+    puzzle_pool.start_refill()  # nadoknadi uzetu slagalicu
     # Initialize variables
     wrong = 0
-    board = Board(screen, size, difficulty)
+    board = Board(screen, size, difficulty, puzzle)
     selected = (-1, -1)
     keyDict = {}
     solved = False
@@ -532,60 +542,11 @@ def main_display(size=3, difficulty=0):
             elif event.type == pygame.KEYDOWN:
                 # Handle key presses
                 if board.board[selected[1]][selected[0]] == 0 and selected != (-1, -1):
-                    if event.key == pygame.K_1:
-                        keyDict[selected] = 1
-
-                    if event.key == pygame.K_2:
-                        keyDict[selected] = 2
-
-                    if event.key == pygame.K_3:
-                        keyDict[selected] = 3
-
-                    if event.key == pygame.K_4:
-                        keyDict[selected] = 4
-
-                    if event.key == pygame.K_5:
-                        keyDict[selected] = 5
-
-                    if event.key == pygame.K_6:
-                        keyDict[selected] = 6
-
-                    if event.key == pygame.K_7:
-                        keyDict[selected] = 7
-
-                    if event.key == pygame.K_8:
-                        keyDict[selected] = 8
-
-                    if event.key == pygame.K_9:
-                        keyDict[selected] = 9
-
-                    if event.key == pygame.K_a:
-                        if size == 4:
-                            keyDict[selected] = 10
-
-                    if event.key == pygame.K_b:
-                        if size == 4:
-                            keyDict[selected] = 11
-
-                    if event.key == pygame.K_c:
-                        if size == 4:
-                            keyDict[selected] = 12
-
-                    if event.key == pygame.K_d:
-                        if size == 4:
-                            keyDict[selected] = 13
-
-                    if event.key == pygame.K_e:
-                        if size == 4:
-                            keyDict[selected] = 14
-
-                    if event.key == pygame.K_f:
-                        if size == 4:
-                            keyDict[selected] = 15
-
-                    if event.key == pygame.K_g:
-                        if size == 4:
-                            keyDict[selected] = 16
+                    # vrijednost se unosi svojim znakom (1-9, pa A-Z i '@' za veće ploče)
+                    symbol = event.unicode.upper() if event.unicode else ""
+                    value = SYMBOLS.find(symbol) + 1 if symbol else 0
+                    if 0 < value <= size**2:
+                        keyDict[selected] = value
                     elif (
                         event.key == pygame.K_BACKSPACE or event.key == pygame.K_DELETE
                     ):
@@ -616,8 +577,8 @@ def main_display(size=3, difficulty=0):
                             # board.board[selected[1]][selected[0]] = keyDict[selected]
                             # del keyDict[selected]
 
-                # Handle hint key
-                if event.key == pygame.K_h:
+                # Handle hint key (kod 25x25 i 36x36 je H vrijednost, pa je hint na F1)
+                if event.key == (pygame.K_h if size <= 4 else pygame.K_F1):
                     board.hint(keyDict)
 
                 # Handle space key
@@ -658,6 +619,7 @@ def welcome_display():
     pygame.display.set_caption("Sudoku Solver")
     icon = pygame.image.load("assets/thumbnail.png")
     pygame.display.set_icon(icon)
+    puzzle_pool.start_refill()  # pool se puni dok korisnik bira veličinu i težinu
     size = 3
     difficulty = 0
     # # Display "Generating Random Grid" text while generating a random grid
@@ -665,8 +627,10 @@ def welcome_display():
     # text = font.render("Sudoku Solver", True, (0, 0, 0))
     # screen.blit(text, (130, 50))
 
-    button_9x9 = Button(130, 150, 550, 75, (144, 238, 144), '9x9 Sudoku')
-    button_16x16 = Button(130, 250, 550, 75, (45, 106, 79), '16x16 Sudoku')
+    button_9x9 = Button(130, 150, 265, 75, (144, 238, 144), '9x9 Sudoku')
+    button_16x16 = Button(415, 150, 265, 75, (45, 106, 79), '16x16 Sudoku')
+    button_25x25 = Button(130, 250, 265, 75, (27, 67, 50), '25x25 Sudoku')
+    button_36x36 = Button(415, 250, 265, 75, (8, 28, 21), '36x36 Sudoku')
 
     radio_button_easy = RadioButton(130, 450, 20, (0, 0, 0), "Easy")
     radio_button_medium = RadioButton(380, 450, 20, (0, 0, 0), "Medium")
@@ -675,7 +639,7 @@ def welcome_display():
     button_ok = Button(315, 550, 150, 75, (144, 238, 144), "OK")
 
     radio_buttons = [radio_button_easy, radio_button_medium, radio_button_hard]
-    buttons = [button_9x9, button_16x16]
+    buttons = [button_9x9, button_16x16, button_25x25, button_36x36]
 
     running = True
     while running:
@@ -692,6 +656,12 @@ def welcome_display():
                 # button_16x16.selected = True
                 # main_display(4)
                 # screen = pygame.display.set_mode((800, 600))
+
+            elif button_25x25.is_clicked(event):
+                size = 5
+
+            elif button_36x36.is_clicked(event):
+                size = 6
             for button in buttons:
                 button.is_clicked_among(buttons, event)
             if event.type == pygame.MOUSEBUTTONDOWN:
@@ -716,6 +686,8 @@ def welcome_display():
         screen.blit(text, (130, 50))
         button_9x9.draw_rect_with_border(screen, (0, 0, 0), 2, (0, 0, 0))
         button_16x16.draw_rect_with_border(screen, (0, 0, 0), 2, (255, 255, 255))
+        button_25x25.draw_rect_with_border(screen, (0, 0, 0), 2, (255, 255, 255))
+        button_36x36.draw_rect_with_border(screen, (0, 0, 0), 2, (255, 255, 255))
         radio_button_easy.draw(screen)
         radio_button_medium.draw(screen)
         radio_button_hard.draw(screen)
@@ -724,5 +696,6 @@ def welcome_display():
 
 
 # main_display()
-welcome_display()
-pygame.quit()
+if __name__ == "__main__":  # refill proces na Windows-u ponovo učitava ovaj modul
+    welcome_display()
+    pygame.quit()
@@ -0,0 +1,127 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+import optimized_backtracking as ob
+import shared_boards
+from flat_board import copy_board
+import sudokutools
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool, cpu_count
+import time
+
+
+def solve_one(board, size=3):
+    """
+    Metoda za rješavanje jedne ploče u okviru paketnog rješavanja: koristi se solve_with_cache sa MRV izborom polja
+    i propagacijom ograničenja, bez keša jer se redoslijed vrijednosti ne isplati računati za svaku ploču posebno.
+    :param list[list[int]] board: Ploča koju je potrebno riješiti; popunjava se na mjestu.
+    :param int size: Veličina ploče.
+    :return: Riješena ploča ako rješenje postoji, u suprotnom None.
+    """
+    if ob.solve_with_cache(board, None, size, propagate=True):
+        return board
+    return None
+
+
+def _solve_chunk(chunk, size=3):
+    """
+    Metoda koju izvršava radni proces: rješava cijeli paket ploča i vraća rješenja istim redoslijedom, tako da se
+    između procesa šalje jedna poruka po paketu umjesto po ploči.
+    :param list chunk: Lista ploča.
+    :param int size: Veličina ploča.
+    :return: Lista rješenja (ili None za ploče bez rješenja).
+    """
+    return [solve_one(board, size) for board in chunk]
+
+
+def _solve_shared_chunk(name, count, size=3):
+    """
+    Metoda koju izvršava radni proces kada je paket u dijeljenoj memoriji: ploče se rješavaju na mjestu u bloku name,
+    a za svaku riješenu ploču se postavlja njena oznaka rezultata. Procesu se šalje samo ime bloka i broj ploča.
+    :param str name: Ime bloka dijeljene memorije (shared_boards.create_block).
+    :param int count: Broj ploča u bloku.
+    :param int size: Veličina ploča.
+    :return: Broj riješenih ploča.
+    """
+    shm, _ = shared_boards.attach(name, size)
+    flags = shared_boards.flags_view(shm.buf, size, count)
+    solved = 0
+    for index in range(count):
+        if solve_one(shared_boards.board_at(shm.buf, size, count, index), size) is not None:
+            flags[index] = 1
+            solved += 1
+    flags.release()
+    return solved
+
+
+def solve_batch(boards, size=3, processes=None, chunksize=256):
+    """
+    Paketno rješavanje velikog broja nezavisnih ploča. Ploče se dijele u pakete od po chunksize i paketi se
+    raspoređuju po procesima, tako da se svaka ploča rješava u cijelosti u jednom procesu (za razliku od
+    parallel_solver koji jednu ploču dijeli na grane). Ulaz može biti lista ili bilo koji iterator, i čita se
+    postepeno: u obradi je najviše 2 * processes paketa, pa memorija ne raste sa veličinom ulaza.
+
+    Svaki paket se upisuje u blok dijeljene memorije (shared_boards), pa se procesu šalje samo ime bloka, a ploče se
+    rješavaju na mjestu u bloku; nazad stižu samo oznake rezultata. Rješenja se prepisuju u ulazne ploče i vraćaju kao
+    generator, istim redoslijedom kao i ulazne ploče; ploča bez rješenja ostaje nepromijenjena (i sa processes=1).
+    :param boards: Lista ili iterator ploča (list[list[int]]).
+    :param int size: Veličina ploča.
+    :param int processes: Broj procesa; None koristi trajni pool iz optimized_backtracking.get_pool(), a 1 rješava
+    sve u trenutnom procesu bez ikakve međuprocesne komunikacije.
+    :param int chunksize: Broj ploča u jednom paketu.
+    :return: Generator rješenja; za ploču bez rješenja vraća se None.
+    """
+    boards = iter(boards)
+    if processes == 1:
+        for board in boards:
+            # kao i kod dijeljene memorije rješava se kopija, a u ulaznu ploču se prepisuje samo rješenje
+            solution = solve_one(copy_board(board), size)
+            if solution is not None:
+                for row in range(size**2):
+                    board[row] = list(solution[row])
+            yield board if solution is not None else None
+        return
+
+    own_pool = processes is not None
+    if own_pool:
+        shared_boards.share_tracker()
+    pool = Pool(processes=processes) if own_pool else ob.get_pool()
+    max_pending = 2 * (processes or cpu_count())
+    pending = deque()  # (rezultat, blok, paket)
+    try:
+        while True:
+            while len(pending) < max_pending:
+                chunk = list(islice(boards, chunksize))
+                if not chunk:
+                    break
+                shm = shared_boards.create_block(chunk, size)
+                pending.append((pool.apply_async(_solve_shared_chunk, (shm.name, len(chunk), size)), shm, chunk))
+            if not pending:
+                return
+            result, shm, chunk = pending.popleft()
+            try:
+                result.get()
+                flags = bytes(shared_boards.flags_view(shm.buf, size, len(chunk)))
+                for index, board in enumerate(chunk):
+                    if flags[index]:
+                        shared_boards.read_board(shm.buf, size, len(chunk), index, board)
+            finally:
+                shm.close()
+                shm.unlink()
+            for index, board in enumerate(chunk):
+                yield board if flags[index] else None
+    finally:
+        for _, shm, _ in pending:
+            shm.close()
+            shm.unlink()
+        if own_pool:
+            pool.terminate()
+            pool.join()
+
+
+if __name__ == "__main__":
+    puzzles = [sudokutools.generate_board(3, 2) for _ in range(1000)]
+    start_time = time.time()
+    solved_count = sum(1 for solved in solve_batch(puzzles, 3) if solved is not None)
+    end_time = time.time()
+    print("Solved {} puzzles, {:.1f} puzzles/s".format(solved_count, solved_count / (end_time - start_time)))
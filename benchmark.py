@@ -0,0 +1,210 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+import sudokutools
+import optimized_backtracking as ob
+import dlx_solver
+from flat_board import copy_board
+from solve_stats import SolveStats
+from contextlib import redirect_stdout
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+
+
+def generate_corpus(size=3, difficulty=0, count=20, seed=0):
+    """
+    Metoda za generisanje reproduktivnog skupa slagalica: za isti seed, veličinu i težinu uvijek se dobijaju iste
+    slagalice, pa se rezultati mogu porediti između različitih verzija koda.
+
+    :param int size: Veličina ploča.
+    :param int difficulty: Težina ploča, kao kod sudokutools.generate_board.
+    :param int count: Broj ploča.
+    :param int seed: Početna vrijednost generatora slučajnih brojeva.
+    :return: Lista ploča.
+    """
+    rng = random.Random("{}-{}-{}".format(seed, size, difficulty))
+    return [sudokutools.generate_board(size, difficulty, rng=rng) for _ in range(count)]
+
+
+def _solve_plain(board, size, stats=None):
+    return sudokutools.solve(board, size, stats)
+
+
+def _solve_cached(board, size, stats=None):
+    return ob.solve_with_cache(board, ob.cache_valid_values(board, size, stats), size, stats=stats)
+
+
+def _solve_cached_ordered(board, size, stats=None):
+    cache = ob.cache_valid_values(board, size, stats)
+    return ob.solve_with_cache(board, ob.orded_valid_values(board, cache, size), size, stats=stats)
+
+
+def _solve_propagate(board, size, stats=None):
+    return ob.solve_with_cache(board, ob.cache_valid_values(board, size, stats), size, propagate=True, stats=stats)
+
+
+def _solve_parallel(board, size, stats=None):
+    with redirect_stdout(io.StringIO()):  # parallel_solver ispisuje rješenje
+        return ob.parallel_solver(board, ob.cache_valid_values(board, size, stats), size, stats=stats) is not None
+
+
+def _solve_dlx(board, size, stats=None):
+    return dlx_solver.solve_dlx(board, size, stats)
+
+
+# Naziv -> metoda koja rješava ploču na mjestu, popunjava opcioni SolveStats i vraća da li je rješenje pronađeno.
+BACKENDS = {
+    "sudokutools.solve": _solve_plain,
+    "solve_with_cache": _solve_cached,
+    "solve_with_cache+orded": _solve_cached_ordered,
+    "solve_with_cache+propagate": _solve_propagate,
+    "parallel_solver": _solve_parallel,
+    "dlx": _solve_dlx,
+}
+
+
+def percentile(values, fraction):
+    """
+    Metoda za percentil sortirane liste vrijednosti (najbliži rang).
+
+    :param list values: Sortirana lista vrijednosti.
+    :param float fraction: Percentil kao broj između 0 i 1.
+    :return: Vrijednost percentila.
+    """
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, int(round(fraction * len(values))) - 1))]
+
+
+def run_backend(name, corpus, size=3, memory=True):
+    """
+    Metoda za mjerenje jednog backend-a nad skupom ploča. Vrijeme se mjeri za svaku ploču posebno, a svako rješavanje
+    popunjava svoj SolveStats (pokušaji, povratci, dubina, tehnike, vrijeme kandidata i pretrage) koji se sabira u
+    ukupnu statistiku; kod parallel_solver statistike grana stižu iz radnih procesa. Maksimalna zauzeta memorija se
+    mjeri u zasebnom prolazu sa tracemalloc i bez statistike, jer on usporava izvršavanje i iskrivio bi vremena.
+
+    :param str name: Naziv backend-a iz BACKENDS.
+    :param list corpus: Lista ploča; ploče se ne mijenjaju.
+    :param int size: Veličina ploča.
+    :param bool memory: Da li se mjeri i maksimalna zauzeta memorija.
+    :return: Rječnik sa rezultatima.
+    """
+    solver = BACKENDS[name]
+    latencies = []
+    solved = 0
+    total = SolveStats()
+    for board in corpus:
+        work = copy_board(board)
+        stats = SolveStats()
+        start_time = time.perf_counter()
+        if solver(work, size, stats):
+            solved += 1
+        latencies.append((time.perf_counter() - start_time) * 1000)
+        total.merge(stats)
+
+    peak_memory = None
+    if memory:
+        tracemalloc.start()
+        for board in corpus:
+            solver(copy_board(board), size)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    elapsed = sum(latencies)
+    latencies.sort()
+    return {
+        "backend": name,
+        "size": size,
+        "count": len(corpus),
+        "solved": solved,
+        "latency_ms": {
+            "mean": elapsed / len(corpus) if corpus else None,
+            "p50": percentile(latencies, 0.50),
+            "p90": percentile(latencies, 0.90),
+            "p99": percentile(latencies, 0.99),
+            "max": latencies[-1] if latencies else None,
+        },
+        "throughput_per_s": len(corpus) / (elapsed / 1000) if elapsed else None,
+        "guesses": total.tries,
+        "guesses_per_solve": total.tries / len(corpus) if corpus else None,
+        "backtracks": total.backtracks,
+        "max_depth": total.max_depth,
+        "techniques": dict(total.techniques),
+        "candidate_time_ms": total.candidate_time * 1000,
+        "search_time_ms": total.search_time * 1000,
+        "peak_memory_bytes": peak_memory,
+    }
+
+
+def _git_commit():
+    """
+    Metoda za hash trenutnog git commit-a, kako bi se rezultati mogli vezati za verziju koda.
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(sizes=(3, 4), difficulties=(0, 1, 2), count=20, seed=0, backends=None, memory=True):
+    """
+    Metoda za pokretanje cijelog benchmark-a: za svaku veličinu i težinu generiše se skup ploča i nad njim se mjere
+    svi izabrani backend-i.
+
+    :param sizes: Veličine ploča.
+    :param difficulties: Težine ploča.
+    :param int count: Broj ploča po veličini i težini.
+    :param int seed: Početna vrijednost generatora slučajnih brojeva.
+    :param backends: Nazivi backend-a iz BACKENDS; podrazumijevano svi.
+    :param bool memory: Da li se mjeri i maksimalna zauzeta memorija.
+    :return: Rječnik pogodan za JSON sa meta podacima i listom rezultata.
+    """
+    backends = list(backends or BACKENDS)
+    results = []
+    for size in sizes:
+        for difficulty in difficulties:
+            corpus = generate_corpus(size, difficulty, count, seed)
+            for name in backends:
+                result = run_backend(name, corpus, size, memory)
+                result["difficulty"] = difficulty
+                results.append(result)
+                print("{:<28} size={} difficulty={} p50={:.3f} ms p99={:.3f} ms {:.1f}/s".format(
+                    name, size, difficulty, result["latency_ms"]["p50"], result["latency_ms"]["p99"],
+                    result["throughput_per_s"] or 0.0))
+    ob.shutdown_pool()
+    return {
+        "meta": {
+            "seed": seed,
+            "count": count,
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark sudoku solver backend-a.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[3, 4])
+    parser.add_argument("--difficulties", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument("--count", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--backends", nargs="+", choices=sorted(BACKENDS), default=None)
+    parser.add_argument("--no-memory", action="store_true", help="bez mjerenja memorije (tracemalloc)")
+    parser.add_argument("--output", default="benchmark.json")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.sizes, args.difficulties, args.count, args.seed, args.backends,
+                           not args.no_memory)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print("Rezultati su upisani u {}".format(args.output))
@@ -0,0 +1,274 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+
+def box_index(row, col, size=3):
+    """
+    Metoda za određivanje rednog broja bloka kojem pripada ćelija (row, col).
+
+    Args:
+        row (int): Indeks reda ćelije.
+        col (int): Indeks kolone ćelije.
+        size (int): Veličina sudoku slagalice; podrazumijevana vrijednost je 3.
+
+    Returns:
+        int: Redni broj bloka, blokovi se broje s lijeva na desno, odozgo na dolje.
+    """
+    return (row // size) * size + col // size
+
+
+def mask_to_values(mask):
+    """
+    Metoda za pretvaranje bitmaske u listu brojeva. Bit na poziciji k (računajući od 0) predstavlja broj k + 1.
+
+    Args:
+        mask (int): Bitmaska dozvoljenih brojeva.
+
+    Returns:
+        list[int]: Brojevi čiji su bitovi postavljeni u maski, u rastućem redoslijedu.
+    """
+    values = []
+    while mask:
+        low = mask & -mask  # izdvajanje najnižeg postavljenog bita
+        values.append(low.bit_length())
+        mask ^= low
+    return values
+
+
+_tables = dict()
+
+
+def cell_tables(size=3):
+    """
+    Metoda za tabele indeksa ćelija koje zavise samo od veličine ploče, pa se računaju jednom po veličini i čuvaju.
+    Ćelija (row, col) ima indeks row * size**2 + col.
+
+    Args:
+        size (int): Veličina sudoku slagalice; podrazumijevana vrijednost je 3.
+
+    Returns:
+        tuple: (cell_row, cell_col, cell_box, peers) - red, kolona i blok svake ćelije, te tuple indeksa ćelija koje
+        dijele red, kolonu ili blok sa tom ćelijom (bez nje same).
+    """
+    if size not in _tables:
+        n = size**2
+        cell_row = tuple(idx // n for idx in range(n * n))
+        cell_col = tuple(idx % n for idx in range(n * n))
+        cell_box = tuple(box_index(cell_row[idx], cell_col[idx], size) for idx in range(n * n))
+        peers = tuple(
+            tuple(other for other in range(n * n) if other != idx and (
+                cell_row[other] == cell_row[idx] or cell_col[other] == cell_col[idx] or
+                cell_box[other] == cell_box[idx]))
+            for idx in range(n * n)
+        )
+        _tables[size] = (cell_row, cell_col, cell_box, peers)
+    return _tables[size]
+
+
+def unit_tables(size=3):
+    """
+    Metoda za jedinice ploče (redove, kolone i blokove) kao tuple indeksa ćelija. Prvih size**2 jedinica su redovi,
+    zatim kolone, pa blokovi.
+
+    Args:
+        size (int): Veličina sudoku slagalice; podrazumijevana vrijednost je 3.
+
+    Returns:
+        tuple[tuple[int]]: Indeksi ćelija svake jedinice.
+    """
+    key = ("units", size)
+    if key not in _tables:
+        n = size**2
+        cell_row, cell_col, cell_box, _ = cell_tables(size)
+        rows = tuple(tuple(range(i * n, (i + 1) * n)) for i in range(n))
+        cols = tuple(tuple(range(j, n * n, n)) for j in range(n))
+        boxes = tuple(tuple(idx for idx in range(n * n) if cell_box[idx] == b) for b in range(n))
+        _tables[key] = rows + cols + boxes
+    return _tables[key]
+
+
+class BoardState:
+    def __init__(self, board, size=3, mrv=False):
+        """
+        Stanje sudoku ploče predstavljeno bitmaskama po redovima, kolonama i blokovima. Za svaki red, kolonu i blok
+        čuva se jedan int u kojem je postavljen bit k ako se broj k + 1 već nalazi u tom redu/koloni/bloku. Pored toga
+        se za svaku ćeliju čuva bitmaska živih kandidata, koja se ažurira inkrementalno pri svakom upisu (broj se
+        uklanja iz kandidata praznih susjeda) i pri svakom eliminisanju kandidata tokom propagacije.
+
+        Sve izmjene se bilježe u trag (trail), pa se povratak unazad radi poništavanjem zapisa iz traga do zapamćene
+        oznake (mark/undo), bez ikakvog kopiranja ploče ili keša. Ploča board se ne kopira, sve izmjene se upisuju
+        direktno u nju.
+
+        Args:
+            board (list[list[int]]): Reprezentacija ploce dimenzija size x size predstavljene kao lista listi
+             od int vrijednosti.
+            size (int): Veličina sudoku slagalice; podrazumijevana vrijednost je 3.
+            mrv (bool): Ako je True, prazne ćelije se drže u "kantama" po broju živih kandidata, pa select_cell
+             bira ćeliju sa najmanje mogućnosti u O(n).
+
+        Attributes:
+            consistent (bool): False ako početna ploča već sadrži isti broj dva puta u nekom redu, koloni ili bloku.
+            empties (list[int]): Indeksi praznih ćelija početne ploče u redoslijedu red po red.
+            values (list[int]): Vrijednosti ćelija po indeksu, 0 za prazno polje.
+            cands (list[int]): Bitmaske živih kandidata po indeksu; popunjena ćelija ima samo bit svoje vrijednosti.
+        """
+        self.board = board
+        self.size = size
+        self.n = size**2
+        self.full_mask = (1 << self.n) - 1
+        self.rows = [0] * self.n
+        self.cols = [0] * self.n
+        self.boxes = [0] * self.n
+        self.consistent = True
+        self.cell_row, self.cell_col, self.cell_box, self.peers = cell_tables(size)
+        self.empties = []
+        self.values = [0] * (self.n * self.n)
+        self.cands = [0] * (self.n * self.n)
+        self.trail = []
+
+        for i in range(self.n):
+            for j in range(self.n):
+                value = board[i][j]
+                if value:
+                    bit = 1 << (value - 1)
+                    b = box_index(i, j, size)
+                    if (self.rows[i] | self.cols[j] | self.boxes[b]) & bit:
+                        self.consistent = False
+                    self.rows[i] |= bit
+                    self.cols[j] |= bit
+                    self.boxes[b] |= bit
+                    self.values[i * self.n + j] = value
+                    self.cands[i * self.n + j] = bit
+                else:
+                    self.empties.append(i * self.n + j)
+
+        for idx in self.empties:
+            self.cands[idx] = self.full_mask & ~(self.rows[self.cell_row[idx]] | self.cols[self.cell_col[idx]] |
+                                                 self.boxes[self.cell_box[idx]])
+
+        self.mrv = mrv
+        if mrv:
+            self.buckets = [set() for _ in range(self.n + 1)]
+            for idx in self.empties:
+                self.buckets[self.cands[idx].bit_count()].add(idx)
+
+    def candidates_mask(self, row, col):
+        """
+        Metoda za bitmasku živih kandidata prazne ćelije (row, col).
+
+        Returns:
+            int: Bitmaska dozvoljenih brojeva, 0 za popunjenu ćeliju.
+        """
+        idx = row * self.n + col
+        return 0 if self.values[idx] else self.cands[idx]
+
+    def candidates(self, row, col):
+        """
+        Metoda za listu dozvoljenih vrijednosti ćelije (row, col), u rastućem redoslijedu.
+
+        Returns:
+            list[int]: Lista dozvoljenih vrijednosti polja.
+        """
+        return mask_to_values(self.candidates_mask(row, col))
+
+    def select_cell(self):
+        """
+        Metoda za izbor prazne ćelije sa najmanjim brojem dozvoljenih vrijednosti (minimum remaining values). Kante se
+        pregledaju od najmanjeg broja, pa je cijena izbora najviše n + 1 provjera, nezavisno od broja praznih polja.
+        Zahtijeva da je stanje kreirano sa mrv=True.
+
+        Returns:
+            tuple[int, int]|None: Pozicija izabrane ćelije, ili None ako nema praznih ćelija.
+        """
+        for bucket in self.buckets:
+            if bucket:
+                idx = next(iter(bucket))
+                return self.cell_row[idx], self.cell_col[idx]
+        return None
+
+    def mark(self):
+        """
+        Metoda za oznaku trenutne pozicije u tragu, do koje se kasnije može vratiti metodom undo.
+
+        Returns:
+            int: Dužina traga.
+        """
+        return len(self.trail)
+
+    def assign(self, idx, value):
+        """
+        Upisivanje vrijednosti value u praznu ćeliju sa indeksom idx. Maske reda, kolone i bloka se ažuriraju, a bit
+        vrijednosti se uklanja iz kandidata svih praznih susjeda; svaka izmjena se bilježi u trag.
+
+        Returns:
+            bool: False ako neki prazni susjed ostane bez kandidata, True u suprotnom. I u slučaju False upis je
+            izvršen i mora se poništiti metodom undo.
+        """
+        bit = 1 << (value - 1)
+        cands, values, trail = self.cands, self.values, self.trail
+        trail.append((idx, cands[idx], True))
+        if self.mrv:
+            self.buckets[cands[idx].bit_count()].discard(idx)
+
+        row, col = self.cell_row[idx], self.cell_col[idx]
+        values[idx] = value
+        cands[idx] = bit
+        self.board[row][col] = value
+        self.rows[row] |= bit
+        self.cols[col] |= bit
+        self.boxes[self.cell_box[idx]] |= bit
+
+        ok = True
+        for peer in self.peers[idx]:
+            mask = cands[peer]
+            if mask & bit and not values[peer]:
+                trail.append((peer, mask, False))
+                cands[peer] = mask ^ bit
+                if self.mrv:
+                    count = mask.bit_count()
+                    self.buckets[count].discard(peer)
+                    self.buckets[count - 1].add(peer)
+                if mask == bit:
+                    ok = False
+        return ok
+
+    def eliminate(self, idx, bits):
+        """
+        Uklanjanje bitova bits iz kandidata prazne ćelije idx, uz bilježenje u trag.
+
+        Returns:
+            int: Broj uklonjenih kandidata, ili -1 ako je ćelija ostala bez kandidata.
+        """
+        mask = self.cands[idx]
+        removed = mask & bits
+        if not removed:
+            return 0
+        self.trail.append((idx, mask, False))
+        self.cands[idx] = mask ^ removed
+        if self.mrv:
+            self.buckets[mask.bit_count()].discard(idx)
+            self.buckets[(mask ^ removed).bit_count()].add(idx)
+        if mask == removed:
+            return -1
+        return removed.bit_count()
+
+    def undo(self, mark):
+        """
+        Poništavanje svih izmjena iz traga zapisanih nakon oznake mark, obrnutim redoslijedom.
+        """
+        cands, values, trail = self.cands, self.values, self.trail
+        while len(trail) > mark:
+            idx, old, placed = trail.pop()
+            if placed:
+                clear = ~(1 << (values[idx] - 1))
+                row, col = self.cell_row[idx], self.cell_col[idx]
+                values[idx] = 0
+                self.board[row][col] = 0
+                self.rows[row] &= clear
+                self.cols[col] &= clear
+                self.boxes[self.cell_box[idx]] &= clear
+            elif self.mrv:
+                self.buckets[cands[idx].bit_count()].discard(idx)
+            cands[idx] = old
+            if self.mrv:
+                self.buckets[old.bit_count()].add(idx)
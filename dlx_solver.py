@@ -0,0 +1,284 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+import sudokutools
+from board_state import box_index
+import time
+
+
+class DancingLinks:
+    def __init__(self, size=3):
+        """
+        Matrica egzaktnog pokrivanja (exact cover) za sudoku ploču veličine size, predstavljena dvostruko povezanim
+        kružnim listama (Dancing Links, Knuth-ov Algoritam X). Kolone matrice su ograničenja: svaka ćelija ima tačno
+        jedan broj, i svaki broj se javlja tačno jednom u svakom redu, koloni i bloku (ukupno 4 * size**4 kolona).
+        Redovi matrice su sve moguće trojke (red, kolona, broj), njih size**6, i svaki red pokriva tačno 4 kolone.
+
+        Čvorovi se čuvaju u paralelnim listama indeksa umjesto u objektima, jer je tako pokrivanje i otkrivanje kolona
+        u Python-u znatno brže. Čvor 0 je korijen, čvorovi 1..broj_kolona su zaglavlja kolona, a iza njih slijede
+        čvorovi matrice. Pokrivanje je potpuno reverzibilno, pa se nakon svakog rješavanja matrica vraća u početno
+        stanje i ista instanca se koristi za sve ploče iste veličine.
+
+        Args:
+            size (int): Veličina sudoku slagalice; podrazumijevana vrijednost je 3.
+        """
+        self.size = size
+        self.n = n = size**2
+        columns = 4 * n * n
+
+        # zaglavlja kolona su povezana u horizontalnu listu zajedno sa korijenom
+        self.left = [i - 1 for i in range(columns + 1)]
+        self.right = [i + 1 for i in range(columns + 1)]
+        self.left[0] = columns
+        self.right[columns] = 0
+        self.up = list(range(columns + 1))
+        self.down = list(range(columns + 1))
+        self.column = list(range(columns + 1))
+        self.count = [0] * (columns + 1)
+        self.row_id = [-1] * (columns + 1)
+        self.row_head = [0] * (n**3)
+        self.active = [True] * (columns + 1)
+
+        for row in range(n):
+            for col in range(n):
+                box = box_index(row, col, size)
+                for value in range(n):
+                    rid = (row * n + col) * n + value
+                    self._add_row(rid, (1 + row * n + col,
+                                        1 + n * n + row * n + value,
+                                        1 + 2 * n * n + col * n + value,
+                                        1 + 3 * n * n + box * n + value))
+
+    def _add_row(self, rid, columns):
+        """
+        Dodavanje reda matrice rid koji pokriva kolone columns. Čvorovi se dodaju na dno svake kolone i međusobno se
+        povezuju u horizontalnu kružnu listu.
+        """
+        first = len(self.column)
+        self.row_head[rid] = first
+        for k, col in enumerate(columns):
+            node = first + k
+            self.left.append(first + (k - 1) % len(columns))
+            self.right.append(first + (k + 1) % len(columns))
+            self.up.append(self.up[col])
+            self.down.append(col)
+            self.down[self.up[col]] = node
+            self.up[col] = node
+            self.column.append(col)
+            self.row_id.append(rid)
+            self.count[col] += 1
+
+    def _cover(self, col):
+        """
+        Pokrivanje kolone col: kolona se izbacuje iz liste zaglavlja, a svi redovi koji je sadrže iz ostalih kolona.
+        """
+        left, right, up, down, column, count = self.left, self.right, self.up, self.down, self.column, self.count
+        right[left[col]] = right[col]
+        left[right[col]] = left[col]
+        self.active[col] = False
+        i = down[col]
+        while i != col:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                count[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def _uncover(self, col):
+        """
+        Otkrivanje kolone col, tačna inverzna operacija metode _cover (čvorovi se vraćaju obrnutim redoslijedom).
+        """
+        left, right, up, down, column, count = self.left, self.right, self.up, self.down, self.column, self.count
+        i = up[col]
+        while i != col:
+            j = left[i]
+            while j != i:
+                count[column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[col]] = col
+        left[right[col]] = col
+        self.active[col] = True
+
+    def _choose_column(self):
+        """
+        Izbor kolone sa najmanje preostalih redova; vraća 0 ako su sve kolone pokrivene.
+        """
+        right, count = self.right, self.count
+        col = right[0]
+        if col == 0:
+            return 0
+        best = count[col]
+        j = right[col]
+        while j != 0 and best > 1:
+            if count[j] < best:
+                col = j
+                best = count[j]
+            j = right[j]
+        return col
+
+    def _select_row(self, r):
+        j = self.right[r]
+        while j != r:
+            self._cover(self.column[j])
+            j = self.right[j]
+
+    def _unselect_row(self, r):
+        j = self.left[r]
+        while j != r:
+            self._uncover(self.column[j])
+            j = self.left[j]
+
+    def _search(self, solution, stats=None):
+        """
+        Pretraga Algoritma X sa eksplicitnim stekom umjesto rekurzije (za 25x25 ploče dubina je do 625 nivoa). Uvijek
+        se bira kolona sa najmanje preostalih redova, pa se ograničenja koja je moguće ispuniti na samo jedan način
+        ispunjavaju bez grananja. Na steku je za svaki nivo izabrana kolona i red koji se trenutno probava; na kraju
+        (i kod uspjeha) sva pokrivanja se poništavaju, pa je matrica spremna za sljedeću ploču.
+
+        Args:
+            solution (list[int]): Redovi matrice izabrani do sada; dopunjava se rješenjem ako ono postoji.
+            stats (SolveStats|None): Statistika koja se popunjava: izabrani redovi su upisi, a poništeni povratci.
+
+        Returns:
+            bool: True ako je pronađeno pokrivanje svih kolona, False u suprotnom.
+        """
+        down, count = self.down, self.count
+        stack = []  # [kolona, red] za svaki nivo
+        placements = backtracks = max_depth = 0
+        while True:
+            col = self._choose_column()
+            if col == 0:
+                break  # sve kolone su pokrivene, ploča je riješena
+            if count[col]:
+                self._cover(col)
+                r = down[col]
+                stack.append([col, r])
+                solution.append(self.row_id[r])
+                self._select_row(r)
+                placements += 1
+                if len(stack) > max_depth:
+                    max_depth = len(stack)
+                continue
+
+            # kolona bez redova: povratak do nivoa koji ima sljedeći red za probati
+            while stack:
+                frame = stack[-1]
+                col, r = frame
+                self._unselect_row(r)
+                solution.pop()
+                backtracks += 1
+                r = down[r]
+                if r != col:
+                    frame[1] = r
+                    solution.append(self.row_id[r])
+                    self._select_row(r)
+                    placements += 1
+                    break
+                self._uncover(col)
+                stack.pop()
+            else:
+                break
+
+        found = col == 0
+        if stats is not None:
+            stats.placements += placements
+            stats.backtracks += backtracks
+            stats.max_depth = max(stats.max_depth, max_depth)
+            stats.solved = found
+        for col, r in reversed(stack):
+            self._unselect_row(r)
+            self._uncover(col)
+        return found
+
+    def solve(self, board, stats=None):
+        """
+        Rješavanje ploče board. Zadata polja se pokrivaju direktno (plaća se samo za zadate vrijednosti), zatim se
+        pokreće pretraga, i na kraju se sva pokrivanja poništavaju obrnutim redoslijedom kako bi matrica bila spremna
+        za sljedeću ploču. Rješenje se upisuje u board.
+
+        Args:
+            board (list[list[int]]): Ploča koju je potrebno riješiti.
+            stats (SolveStats|None): Statistika rješavanja; pokrivanje zadatih polja se računa kao candidate_time.
+
+        Returns:
+            bool: True ako slagalica ima rješenje, False u suprotnom.
+        """
+        start_time = time.perf_counter() if stats is not None else 0.0
+        n = self.n
+        covered = []
+        consistent = True
+        for row in range(n):
+            for col in range(n):
+                value = board[row][col]
+                if value:
+                    head = self.row_head[(row * n + col) * n + value - 1]
+                    j = head
+                    while True:
+                        if not self.active[self.column[j]]:
+                            consistent = False  # isto ograničenje je već ispunjeno drugim zadatim poljem
+                            break
+                        self._cover(self.column[j])
+                        covered.append(self.column[j])
+                        j = self.right[j]
+                        if j == head:
+                            break
+                if not consistent:
+                    break
+            if not consistent:
+                break
+
+        solution = []
+        if stats is not None:
+            stats.solved = False
+            search_start = time.perf_counter()
+            stats.candidate_time += search_start - start_time
+        found = consistent and self._search(solution, stats)
+        if stats is not None:
+            stats.search_time += time.perf_counter() - search_start
+
+        for col in reversed(covered):
+            self._uncover(col)
+
+        if found:
+            for rid in solution:
+                cell, value = divmod(rid, n)
+                board[cell // n][cell % n] = value + 1
+        return found
+
+
+_matrices = dict()
+
+
+def solve_dlx(board, size=3, stats=None):
+    """
+    Rješavanje sudoku slagalice kao problema egzaktnog pokrivanja (Dancing Links). Ulaz i izlaz su isti kao kod
+    metoda sudokutools.solve i solve_with_cache: ploča se popunjava na mjestu. Matrica pokrivanja se gradi jednom po
+    veličini ploče i ponovo koristi za sve naredne ploče te veličine. Dijeljena matrica nije zaštićena za istovremeno
+    korišćenje iz više niti; procesi dobijaju svoju kopiju.
+
+    Args:
+        board (list[list[int]]): Reprezentacija ploce dimenzija size x size predstavljene kao lista listi
+         od int vrijednosti.
+        size (int): Veličina sudoku slagalice; podrazumijevana vrijednost je 3.
+        stats (SolveStats|None): Statistika rješavanja koja se popunjava; bez nje se ništa ne mjeri.
+
+    Returns:
+        bool: True ako slagalica ima rješenje, False u suprotnom.
+    """
+    if size not in _matrices:
+        _matrices[size] = DancingLinks(size)
+    return _matrices[size].solve(board, stats)
+
+
+if __name__ == "__main__":
+    board = sudokutools.generate_board(4, 3)
+    sudokutools.print_board(board, 4)
+    start_time = time.time()
+    solve_dlx(board, 4)
+    end_time = time.time()
+    sudokutools.print_board(board, 4)
+    print("Time taken to solve: {} ms".format((end_time - start_time) * 1000))
@@ -0,0 +1,150 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+from board_state import cell_tables, unit_tables
+
+# Znakovi za vrijednosti 1..36; vrijednosti 10-35 su slova A-Z, a 36 je '@' (0 je već oznaka praznog polja).
+SYMBOLS = "123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ@"
+BLANKS = ".0"
+
+
+def _tables(blank):
+    """
+    Tabele za bytes.translate: vrijednost -> znak i znak -> vrijednost (255 za neispravan znak).
+    """
+    to_text = bytearray(range(256))
+    to_text[0] = ord(blank)
+    for value, char in enumerate(SYMBOLS, start=1):
+        to_text[value] = ord(char)
+    from_text = bytearray([255]) * 256
+    for char in BLANKS:
+        from_text[ord(char)] = 0
+    for value, char in enumerate(SYMBOLS, start=1):
+        from_text[ord(char)] = from_text[ord(char.lower())] = value
+    return bytes(to_text), bytes(from_text)
+
+
+_TO_TEXT = {blank: _tables(blank)[0] for blank in BLANKS}
+_FROM_TEXT = _tables(".")[1]
+
+
+class FlatBoard:
+    __slots__ = ("size", "n", "data")
+
+    def __init__(self, board=None, size=3):
+        """
+        Kompaktna ploča: sve vrijednosti su u jednom bytearray-u od size**4 bajtova (red po red), umjesto liste listi
+        Python int objekata, pa zauzima oko deset puta manje memorije, a kopiranje i slanje radnim procesima (pickle)
+        je jedno kopiranje bajtova. Indeksiranje board[row] vraća memoryview reda, pa board[row][col] radi i za čitanje
+        i za upis kao kod liste listi i postojeće metode (BoardState, solve_with_cache, format_puzzle...) rade sa
+        obje reprezentacije. Kao i lista listi, ploča je promjenljiva i nema heš; za ključ rječnika ili skupa se koristi
+        bytes(board.data).
+
+        Args:
+            board: Lista listi, drugi FlatBoard, bytes/bytearray/memoryview od size**4 vrijednosti (bytearray i
+             memoryview se preuzimaju bez kopiranja), tekstualni zapis kao kod puzzle_io.parse_puzzle, ili None za
+             praznu ploču.
+            size (int): Veličina sudoku slagalice; podrazumijevana vrijednost je 3.
+
+        Raises:
+            ValueError: Ako ulaz nema size**4 vrijednosti ili sadrži neispravnu vrijednost.
+        """
+        self.size = size
+        self.n = n = size**2
+        if board is None:
+            data = bytearray(n * n)
+        elif isinstance(board, FlatBoard):
+            data = bytearray(board.data)
+        elif isinstance(board, (bytearray, memoryview)):
+            data = board  # bez kopiranja, npr. dio dijeljene memorije
+        elif isinstance(board, bytes):
+            data = bytearray(board)
+        elif isinstance(board, str):
+            data = bytearray(board.strip().encode("ascii", "replace").translate(_FROM_TEXT))
+        else:
+            data = bytearray(value for row in board for value in row)
+        if len(data) != n * n:
+            raise ValueError("Ploča veličine {} mora imati {} vrijednosti".format(size, n * n))
+        if data and max(data) > n:
+            raise ValueError("Neispravna vrijednost na ploči veličine {}".format(size))
+        self.data = data
+
+    def __getitem__(self, row):
+        return memoryview(self.data)[row * self.n:(row + 1) * self.n]
+
+    def __setitem__(self, row, values):
+        self.data[row * self.n:(row + 1) * self.n] = bytes(values)
+
+    def __len__(self):
+        return self.n
+
+    def __iter__(self):
+        view = memoryview(self.data)
+        return (view[i * self.n:(i + 1) * self.n] for i in range(self.n))
+
+    def __eq__(self, other):
+        if isinstance(other, FlatBoard):
+            return self.size == other.size and self.data == other.data
+        try:
+            return self.to_list() == [list(row) for row in other]
+        except TypeError:
+            return NotImplemented
+
+    def __reduce__(self):
+        return FlatBoard, (bytes(self.data), self.size)
+
+    def __copy__(self):
+        return self.copy()
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def __repr__(self):
+        return "FlatBoard({!r}, {})".format(self.to_string(), self.size)
+
+    def copy(self):
+        """
+        Metoda za kopiju ploče: jedno kopiranje size**4 bajtova.
+        """
+        return FlatBoard(bytearray(self.data), self.size)
+
+    def to_list(self):
+        """
+        Metoda za pretvaranje ploče u listu listi int vrijednosti.
+        """
+        return [list(self.data[i * self.n:(i + 1) * self.n]) for i in range(self.n)]
+
+    def to_string(self, blank="."):
+        """
+        Metoda za tekstualni zapis ploče, isti kao puzzle_io.format_puzzle; pretvaranje je jedan bytes.translate.
+        """
+        return bytes(self.data).translate(_TO_TEXT[blank]).decode("ascii")
+
+    @property
+    def peers(self):
+        """
+        Za svaku ćeliju (indeks row * n + col) tuple indeksa ćelija iz istog reda, kolone ili bloka.
+        """
+        return cell_tables(self.size)[3]
+
+    @property
+    def units(self):
+        """
+        Redovi, kolone i blokovi ploče kao tuple indeksa ćelija.
+        """
+        return unit_tables(self.size)
+
+
+def copy_board(board):
+    """
+    Metoda za kopiju ploče u istoj reprezentaciji: FlatBoard se kopira kao bajtovi, a lista listi red po red (što je
+    za listu int vrijednosti isto što i deepcopy, ali bez njegovog obilaska i memo rječnika).
+
+    Args:
+        board (list[list[int]]|FlatBoard): Ploča.
+
+    Returns:
+        Kopija ploče.
+    """
+    if isinstance(board, FlatBoard):
+        return board.copy()
+    return [list(row) for row in board]
@@ -0,0 +1,286 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Paketna obrada velikog broja ploča nizovima NumPy-a. NumPy je potreban samo ovom modulu; ostatak projekta ga ne
+# koristi, pa se instalira samo ako je potrebna paketna obrada (pip install numpy).
+from flat_board import FlatBoard
+import optimized_backtracking as ob
+import sudokutools
+import numpy as np
+import sys
+import time
+
+# Broj ćelija (ploča x n x n) koje se obrađuju odjednom; ograničava memoriju međurezultata kod miliona ploča, pa se
+# broj ploča u dijelu smanjuje sa veličinom ploče (65536 ploča 9x9, 4096 ploča 36x36).
+CHUNK_CELLS = 65536 * 81
+# Isto za propagaciju, čiji su međurezultati oblika ploča x jedinica x ćelija x vrijednost (n**3 po ploči).
+PROPAGATE_CHUNK_VALUES = 4096 * 729
+
+
+def chunk_size(budget, per_board):
+    """
+    Broj ploča u jednom dijelu obrade: budget elemenata međurezultata, kada svaka ploča zauzima per_board elemenata.
+    """
+    return max(1, budget // per_board)
+
+
+def to_array(boards, size=3):
+    """
+    Metoda za pretvaranje ploča u niz oblika (N, n, n) tipa uint8, gdje je n = size**2.
+
+    Args:
+        boards: Lista ploča (lista listi, FlatBoard ili tekstualni zapis kao kod puzzle_io.parse_puzzle), ili već
+         gotov niz oblika (N, n, n).
+        size (int): Veličina ploča.
+
+    Returns:
+        numpy.ndarray: Niz ploča.
+    """
+    n = size**2
+    if isinstance(boards, np.ndarray):
+        return boards.reshape(-1, n, n).astype(np.uint8, copy=False)
+    data = b"".join(bytes(FlatBoard(board, size).data) for board in boards)
+    return np.frombuffer(data, dtype=np.uint8).reshape(-1, n, n)
+
+
+def mask_dtype(size=3):
+    """
+    Najmanji neoznačeni tip u koji staje bitmaska od size**2 bitova.
+    """
+    return np.uint16 if size**2 <= 16 else (np.uint32 if size**2 <= 32 else np.uint64)
+
+
+def to_boxes(arr, size=3):
+    """
+    Metoda koja preuređuje ploče (N, n, n) tako da je osa 1 redni broj bloka, a osa 2 položaj ćelije u bloku, pa se
+    blokovi obrađuju isto kao redovi. Ose nakon druge (npr. vrijednosti) ostaju iste. Preuređivanje je samo sebi
+    inverzno: to_boxes(to_boxes(a)) == a.
+    """
+    count, n, rest = arr.shape[0], size**2, arr.shape[3:]
+    extra = tuple(range(5, 5 + len(rest)))
+    return arr.reshape((count, size, size, size, size) + rest).transpose((0, 1, 3, 2, 4) + extra).reshape(
+        (count, n, n) + rest)
+
+
+def value_bits(arr, size=3):
+    """
+    Metoda koja svaku vrijednost v > 0 pretvara u bit 1 << (v - 1), a prazno polje u 0.
+    """
+    dtype = mask_dtype(size)
+    shifted = np.left_shift(dtype(1), (arr.astype(dtype) - 1) % dtype(size**2))
+    return np.where(arr > 0, shifted, dtype(0))
+
+
+def unit_masks(arr, size=3):
+    """
+    Metoda za bitmaske vrijednosti koje su već upisane u svaki red, kolonu i blok.
+
+    Returns:
+        tuple: Tri niza oblika (N, n) - maske redova, kolona i blokova.
+    """
+    bits = value_bits(arr, size)
+    return (np.bitwise_or.reduce(bits, axis=2), np.bitwise_or.reduce(bits, axis=1),
+            np.bitwise_or.reduce(to_boxes(bits, size), axis=2))
+
+
+def candidate_masks(arr, size=3):
+    """
+    Metoda za bitmaske dozvoljenih vrijednosti svih praznih polja svih ploča odjednom (bit k predstavlja vrijednost
+    k + 1, kao u board_state). Popunjena polja imaju masku 0.
+
+    Args:
+        arr (numpy.ndarray): Ploče oblika (N, n, n).
+        size (int): Veličina ploča.
+
+    Returns:
+        numpy.ndarray: Maske oblika (N, n, n).
+    """
+    arr = to_array(arr, size)
+    count, n = arr.shape[0], size**2
+    rows, cols, boxes = unit_masks(arr, size)
+    box_of_cell = np.repeat(np.repeat(boxes.reshape(count, size, size), size, axis=1), size, axis=2)
+    full = mask_dtype(size)((1 << n) - 1)
+    used = rows[:, :, None] | cols[:, None, :] | box_of_cell
+    return np.where(arr == 0, full & ~used, 0).astype(mask_dtype(size))
+
+
+def _duplicates(units):
+    """
+    Za jedinice oblika (N, n, n) (osa 2 su ćelije jedinice) vraća koje jedinice sadrže neku vrijednost više puta.
+    """
+    ordered = np.sort(units, axis=2)
+    return ((ordered[:, :, 1:] == ordered[:, :, :-1]) & (ordered[:, :, 1:] > 0)).any(axis=2)
+
+
+def validate(arr, size=3, complete=True):
+    """
+    Metoda za provjeru validnosti N ploča odjednom: nijedan red, kolona ni blok ne smiju sadržati istu vrijednost
+    dva puta, a sa complete=True ploča ne smije imati ni prazna polja (provjera riješene ploče). Ploče se obrađuju u
+    dijelovima od po CHUNK_CELLS ćelija.
+
+    Args:
+        arr (numpy.ndarray): Ploče oblika (N, n, n).
+        size (int): Veličina ploča.
+        complete (bool): Da li ploča mora biti potpuno popunjena.
+
+    Returns:
+        numpy.ndarray: Niz bool vrijednosti oblika (N,), True za validnu ploču.
+    """
+    arr = to_array(arr, size)
+    valid = np.empty(arr.shape[0], dtype=bool)
+    chunk = chunk_size(CHUNK_CELLS, size**4)
+    for start in range(0, arr.shape[0], chunk):
+        part = arr[start:start + chunk]
+        bad = (_duplicates(part) | _duplicates(part.transpose(0, 2, 1))
+               | _duplicates(to_boxes(part, size))).any(axis=1)
+        if complete:
+            bad |= (part == 0).any(axis=(1, 2))
+        valid[start:start + chunk] = ~bad
+    return valid
+
+
+def _conflicts_in(units):
+    """
+    Za jedinice oblika (N, n, n) vraća ćelije čija se vrijednost ponavlja u istoj jedinici. Kao kod _duplicates,
+    jedinice se sortiraju, pa se ponovljena vrijednost prepoznaje po jednakom susjedu, a oznake se vraćaju na
+    originalne položaje ćelija.
+    """
+    order = np.argsort(units, axis=2, kind="stable")
+    ordered = np.take_along_axis(units, order, axis=2)
+    equal = ordered[:, :, 1:] == ordered[:, :, :-1]
+    repeated = np.zeros(units.shape, dtype=bool)
+    repeated[:, :, 1:] |= equal
+    repeated[:, :, :-1] |= equal
+    repeated &= ordered > 0
+    result = np.empty_like(repeated)
+    np.put_along_axis(result, order, repeated, axis=2)
+    return result
+
+
+def conflicts(arr, size=3):
+    """
+    Metoda za položaje konflikata: ćelije čija se vrijednost ponavlja u njihovom redu, koloni ili bloku.
+
+    Args:
+        arr (numpy.ndarray): Ploče oblika (N, n, n).
+        size (int): Veličina ploča.
+
+    Returns:
+        numpy.ndarray: Niz bool vrijednosti oblika (N, n, n); np.argwhere daje trojke (ploča, red, kolona).
+    """
+    arr = to_array(arr, size)
+    result = np.empty(arr.shape, dtype=bool)
+    chunk = chunk_size(CHUNK_CELLS, size**4)
+    for start in range(0, arr.shape[0], chunk):
+        part = arr[start:start + chunk]
+        result[start:start + chunk] = (_conflicts_in(part) | _conflicts_in(part.transpose(0, 2, 1)).transpose(0, 2, 1)
+                                       | to_boxes(_conflicts_in(to_boxes(part, size)), size))
+    return result
+
+
+def _unit_cells(size=3):
+    """
+    Za svaku vrstu jedinice (redovi, kolone, blokovi) nizovi (n, n) sa redom i kolonom ćelije c jedinice u, kao i
+    metoda koja maske ploča preuređuje u oblik (N, jedinica, ćelija).
+    """
+    n = size**2
+    unit = np.arange(n)[:, None].repeat(n, axis=1)
+    cell = np.arange(n)[None, :].repeat(n, axis=0)
+    return (
+        (unit, cell, lambda a: a),
+        (cell, unit, lambda a: a.swapaxes(1, 2)),
+        ((unit // size) * size + cell // size, (unit % size) * size + cell % size, lambda a: to_boxes(a, size)),
+    )
+
+
+def _propagate_chunk(arr, size):
+    """
+    Propagacija naked i hidden single tehnika nad dijelom ploča; arr se mijenja na mjestu.
+
+    Returns:
+        numpy.ndarray: Oznake ploča kod kojih je pronađena kontradikcija.
+    """
+    count, n = arr.shape[0], size**2
+    dtype = mask_dtype(size)
+    full = dtype((1 << n) - 1)
+    bit_values = np.left_shift(dtype(1), np.arange(n, dtype=dtype))
+    units = _unit_cells(size)
+    dead = np.zeros(count, dtype=bool)
+    active = np.arange(count)
+
+    while active.size:
+        part = arr[active]
+        empty = part == 0
+        masks = candidate_masks(part, size)
+        has = (masks[..., None] & bit_values) != 0  # (k, n, n, vrijednost)
+
+        # kontradikcije: prazno polje bez kandidata, ponovljena vrijednost, ili vrijednost bez mjesta u jedinici
+        bad = (empty & (masks == 0)).any(axis=(1, 2))
+        bad |= (_duplicates(part) | _duplicates(part.transpose(0, 2, 1))
+                | _duplicates(to_boxes(part, size))).any(axis=1)
+        for placed, (_, _, view) in zip(unit_masks(part, size), units):
+            bad |= ((np.bitwise_or.reduce(view(masks), axis=2) | placed) != full).any(axis=1)
+
+        # naked single: jedini kandidat polja
+        new = np.where(empty & (has.sum(axis=3) == 1), has.argmax(axis=3) + 1, 0).astype(np.uint8)
+        # hidden single: vrijednost koja u jedinici ima samo jedno mjesto
+        for unit_rows, unit_cols, view in units:
+            in_unit = view(has)  # (k, jedinica, ćelija, vrijednost)
+            board_idx, unit_idx, value_idx = np.nonzero(in_unit.sum(axis=2) == 1)
+            cell_idx = in_unit.argmax(axis=2)[board_idx, unit_idx, value_idx]
+            new[board_idx, unit_rows[unit_idx, cell_idx], unit_cols[unit_idx, cell_idx]] = value_idx + 1
+
+        progress = (new > 0).any(axis=(1, 2)) & ~bad
+        arr[active] = np.where(new > 0, new, part)
+        dead[active[bad]] = True
+        active = active[progress]
+    return dead
+
+
+def solve_array(boards, size=3):
+    """
+    Paketno rješavanje: naked i hidden single tehnike se primjenjuju na sve ploče odjednom operacijama nad nizovima,
+    sve dok neka ploča napreduje. Ploče koje su na kraju i dalje nepotpune (potrebna je pretraga) se dovršavaju
+    skalarno metodom solve_with_cache sa propagacijom. Većina lakih i srednjih slagalica se riješi bez pretrage, pa
+    se najveći dio paketa rješava brzinom NumPy-a.
+
+    Args:
+        boards: Ploče, kao kod to_array.
+        size (int): Veličina ploča.
+
+    Returns:
+        tuple: (rješenja kao niz (N, n, n), oznake riješenih ploča (N,), broj ploča koje su zahtijevale pretragu).
+    """
+    arr = np.array(to_array(boards, size))  # kopija, ulaz se ne mijenja
+    dead = np.zeros(arr.shape[0], dtype=bool)
+    chunk = chunk_size(PROPAGATE_CHUNK_VALUES, size**6)
+    for start in range(0, arr.shape[0], chunk):
+        dead[start:start + chunk] = _propagate_chunk(arr[start:start + chunk], size)
+
+    unresolved = np.nonzero(~dead & (arr == 0).any(axis=(1, 2)))[0]
+    for index in unresolved:
+        board = arr[index].tolist()
+        if ob.solve_with_cache(board, None, size, propagate=True):
+            arr[index] = board
+        else:
+            dead[index] = True
+    solved = ~dead & validate(arr, size)
+    return arr, solved, len(unresolved)
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    puzzles = [sudokutools.generate_board(size, 1, rng=seed) for seed in range(2000)]
+    start_time = time.time()
+    solutions, solved, searched = solve_array(puzzles, size)
+    end_time = time.time()
+    print("Solved {} of {} puzzles ({} needed search), {:.0f} puzzles/s".format(
+        int(solved.sum()), len(puzzles), searched, len(puzzles) / (end_time - start_time)))
+
+    grids = to_array([sudokutools.generate_solution(size, seed) for seed in range(1000)], size)
+    grids = np.tile(grids, (100, 1, 1))
+    grids[::7, 0, 0] = grids[::7, 0, 1]  # svaka sedma ploča dobija konflikt
+    start_time = time.time()
+    valid = validate(grids, size)
+    end_time = time.time()
+    print("Validated {} grids ({} valid), {:.0f} grids/s".format(len(grids), int(valid.sum()),
+                                                                 len(grids) / (end_time - start_time)))
@@ -1,13 +1,23 @@
-import copy
 # from concurrent.futures import ProcessPoolExecutor
 # from multiprocessing import Pool, Manager
 import sudokutools
-from multiprocessing import Pool, cpu_count
+from board_state import BoardState, mask_to_values
+from flat_board import copy_board
+import shared_boards
+import propagation
+import search
+from solve_stats import SolveStats
+import tracing
+from multiprocessing import Pool, RawValue, cpu_count
+from collections import deque
+import atexit
+import math
 import time
 import timeit
 from functools import partial
 
-broj_pokusaja = 0
+_pool = None
+_generation = None  # dijeljeni brojač paralelnih poziva, postavlja se u get_pool i u svakom radnom procesu
 # start_vreme = time.time()
 
 
@@ -41,61 +51,46 @@ def allowed_values(board, row, col, size=3):
     Returns:
         list: Lista dozvoljenih vrijednosti polja.
     """
-    number_list = list()
+    used = 0
+    for k in range(size**2):
+        used |= 1 << board[row][k]  # bit 0 odgovara praznom polju i ne utiče na rezultat
+        used |= 1 << board[k][col]
 
-    for number in range(1, size**2+1):
+    row_block_start = size * (row // size)
+    col_block_start = size * (col // size)
+    for i in range(row_block_start, row_block_start + size):
+        for j in range(col_block_start, col_block_start + size):
+            used |= 1 << board[i][j]
 
-        found = False
-        # Check if all row elements include this number
-        for j in range(size**2):
-            if board[row][j] == number:
-                found = True
-                break
-        # Check if all column elements include this number
-        if found:
-            continue
-        else:
-            for i in range(size**2):
-                if board[i][col] == number:
-                    found = True
-                    break
-
-        # Check if the number is already included in the block
-        if found:
-            continue
-        else:
-            row_block_start = size * (row // size)
-            col_block_start = size * (col // size)
-
-            row_block_end = row_block_start + size
-            col_block_end = col_block_start + size
-            for i in range(row_block_start, row_block_end):
-                for j in range(col_block_start, col_block_end):
-                    if board[i][j] == number:
-                        found = True
-                        break
-        if not found:
-            number_list.append(number)
-    return number_list
+    return mask_to_values(((1 << size**2) - 1) & ~(used >> 1))
 
 
-def cache_valid_values(board, size=3):
+def cache_valid_values(board, size=3, stats=None):
     """
     Metoda za određivanje keša koji čuva dozvoljenje vrijednosti za svako prazno polje na tabeli.
     Args:
        board (list[list[int]]): Reprezentacija ploce dimenzija _size_x_size_ predstavljene kao lista listi
        od int vrijednosti.
        size (int): Veličina sudoku slagalice; podrazumijevana vrijednost je 3.
+       stats (SolveStats|None): Ako je zadat, vrijeme računanja keša se dodaje u stats.candidate_time.
 
     Returns:
         dict: Keš dozvoljenih vrijednosti za svako polje ploče, na način da za ključ, koji predstavlja indeks
         pozicije, se čuva lista dozvoljenih vrijednosti na toj lokaciji.
     """
-    cache = dict()
-    for i in range(size**2):
-        for j in range(size**2):
-            if board[i][j] == 0:
-                cache[(i, j)] = allowed_values(board, i, j, size)
+    with tracing.span("cache_valid_values", size=size) as trace:
+        start_time = time.perf_counter() if stats is not None else 0.0
+        state = BoardState(board, size)  # maske se računaju jednom za cijelu ploču, umjesto za svako polje
+        cache = dict()
+        for i in range(size**2):
+            for j in range(size**2):
+                if board[i][j] == 0:
+                    cache[(i, j)] = state.candidates(i, j)
+        if stats is not None:
+            stats.candidate_time += time.perf_counter() - start_time
+        if trace:
+            trace.counter("cache_valid_values", cells=len(cache),
+                          candidates=sum(len(values) for values in cache.values()))
     return cache
 
 
@@ -105,7 +100,7 @@ def generate_possible_boards(board, size=3):
     popunjavanjem praznih polja dozvoljenim vrijednostima za ta polja. Metoda funkcioniše na način da se prazno polje
     popuni određenom dozvoljenom vrijednošću i onda se takva ploča (sa tom popunjenom vrijednošću) šalje u listu
     mogućih ploča za našu ploču. Nakon što se takva ploča stavi u listu mogućih ploča, for petlja se opet vrti i radi
-    deepcopy početne ploče (board) i popunjava prazno polje (naredno ili isto) sa validnom vrijednošću (u slučaju istog
+    kopiju početne ploče (board) i popunjava prazno polje (naredno ili isto) sa validnom vrijednošću (u slučaju istog
     polja popunjava se sa narednom validnom vrijednošću). Broj generisanih ploča se ograničava na broj niti (logičkih
     jezgara).
     :param (list[list[int]]) board: Ploča za koju tražimo moguće ploče.
@@ -114,98 +109,276 @@ def generate_possible_boards(board, size=3):
     """
     possible_boards = []
     empty_cells = find_all_empty(board, size)  # Pronađite sve prazne ćelije na tabli
+    state = BoardState(board, size)
 
     for cell in empty_cells:
-        for num in range(1, size**2+1):  # Probajte svaki broj od 1 do size**2, MOGLO SE STAVITI I CACHE ali je isto otp
-            if sudokutools.valid(board, cell, num, size):  # Proverite da li je broj validan za tu ćeliju
-                new_board = copy.deepcopy(board)
-                new_board[cell[0]][cell[1]] = num  # Postavite broj u ćeliju
-                possible_boards.append(new_board)
-                if len(possible_boards) >= cpu_count():  # Ograničite broj generisanih tabli na broj niti
-                    return possible_boards
+        for num in state.candidates(cell[0], cell[1]):  # Samo brojevi validni za tu ćeliju
+            new_board = copy_board(board)
+            new_board[cell[0]][cell[1]] = num  # Postavite broj u ćeliju
+            possible_boards.append(new_board)
+            if len(possible_boards) >= cpu_count():  # Ograničite broj generisanih tabli na broj niti
+                return possible_boards
 
     return possible_boards
 
 
-def parallel_solver(board, cache, size=3):
+def _estimate_work(state):
     """
-    Metoda koja poziva paralelno rješavanje za datu ploču board. Prvo se na osnovu mogućih ploča za datu ploču board
-    (koje dobijamo na osnovu metode generate_possible_board(board, size)) i broja logičkih procesa koje ima naš uređaj
-    vrši paralelizacija na način da se na svaku ploču mapira metoda koja rješava tu ploču koristeći backtracking
-    algoritam.
+    Procjena veličine podstabla pretrage za stanje state: log2 proizvoda broja kandidata svih praznih polja.
+    :param BoardState state: Stanje ploče nakon propagacije.
+    :return: Procjena (veća vrijednost znači više posla).
+    """
+    return sum(math.log2(state.cands[idx].bit_count()) for idx in state.empties if not state.values[idx])
+
+
+def split_frontier(board, size=3, target=None, cache=None):
+    """
+    Metoda za podjelu ploče board na nezavisne podploče za paralelno rješavanje. Granica pretrage (frontier) se
+    proširuje u širinu: svaka ploča iz reda se propagira, grana se po njenom polju sa najmanje kandidata, a djeca koja
+    nakon propagacije nisu kontradiktorna se vraćaju na kraj reda. Proširivanje staje kada broj ploča dostigne target.
+    Za razliku od generate_possible_boards, sve podploče su validne i grananje ne ostaje na prvih par polja, a ploče
+    su poređane od najveće procijenjene količine posla ka najmanjoj, pa najduže grane počinju prve.
+    :param list[list[int]] board: Ploča koja se dijeli.
+    :param int size: Veličina ploče.
+    :param int target: Željeni broj podploča; podrazumijevano 4 * cpu_count().
+    :param dict cache: Keš sa redoslijedom dozvoljenih vrijednosti, koristi se za redoslijed djece.
+    :return: Lista podploča; ako je neka ploča već riješena propagacijom, vraća se samo ona.
+    """
+    if target is None:
+        target = 4 * cpu_count()
+    cache = cache or {}
+
+    frontier = deque([(0.0, copy_board(board))])  # parovi (procjena posla, ploča)
+    while frontier and len(frontier) < target:
+        current = frontier.popleft()[1]
+        state = BoardState(current, size, mrv=True)
+        if not state.consistent or not propagation.propagate(state):
+            continue
+        blank = state.select_cell()
+        if not blank:
+            return [current]  # propagacija je riješila ploču
+        blank = blank[0] * state.n + blank[1]
+
+        mark = state.mark()
+        for value in _try_values(state, blank, cache):
+            if state.assign(blank, value) and propagation.propagate(state):
+                frontier.append((_estimate_work(state), copy_board(current)))
+            state.undo(mark)
+        if not frontier:
+            break
+
+    for _, item in frontier:
+        if sudokutools.find_empty(item, size) is None:
+            return [item]
+    return [item for _, item in sorted(frontier, key=lambda pair: pair[0], reverse=True)]
+
+
+def get_pool():
+    """
+    Metoda koja vraća trajni skup procesa (pool) za paralelno rješavanje. Pool se kreira pri prvom pozivu i ponovo
+    koristi u svim narednim pozivima, umjesto da se za svaku ploču iznova pokreće cpu_count() procesa. Svaki proces pri
+    pokretanju dobija zajednički brojač poziva preko kojeg se otkazuju grane koje više nisu potrebne.
+    :return: multiprocessing.Pool objekat.
+    """
+    global _pool, _generation
+    if _pool is None:
+        _generation = RawValue("L", 0)
+        shared_boards.share_tracker()
+        _pool = Pool(processes=cpu_count(), initializer=_init_worker, initargs=(_generation,))
+        atexit.register(shutdown_pool)
+    return _pool
+
+
+def shutdown_pool():
+    """
+    Metoda za gašenje trajnog pool-a procesa; sljedeći paralelni poziv će kreirati novi.
+    """
+    global _pool
+    if _pool is not None:
+        _pool.terminate()
+        _pool.join()
+        _pool = None
+
+
+def _init_worker(generation):
+    """
+    Inicijalizacija radnog procesa: pamti se zajednički brojač poziva.
+    :param generation: Dijeljena vrijednost sa rednim brojem trenutnog paralelnog poziva.
+    """
+    global _generation
+    _generation = generation
+
+
+def parallel_solver(board, cache, size=3, split_factor=4, stats=None):
+    """
+    Metoda koja poziva paralelno rješavanje za datu ploču board. Ploča se prvo metodom split_frontier dijeli na
+    split_factor * cpu_count() validnih podploča poređanih po procijenjenoj količini posla. Podploče i keš se upisuju
+    u jedan blok dijeljene memorije (shared_boards), pa se procesima šalju samo redni brojevi podploča, jedan po jedan
+    (chunksize=1), tako da svaki proces uzima sljedeću podploču iz zajedničkog reda čim završi prethodnu, i
+    opterećenje ostaje ravnomjerno i kada su grane veoma različite veličine. Proces rješava podploču na mjestu u
+    dijeljenoj memoriji i vraća samo oznaku uspjeha. Rezultati se preuzimaju
+    redoslijedom završavanja (imap_unordered), pa se rješenje vraća čim ga prva grana pronađe. Tada se uvećava
+    zajednički brojač poziva, a preostale grane to primjećuju u sljedećem čvoru pretrage i odmah završavaju, tako da
+    pool ostaje slobodan za naredni poziv.
     :param list[list[int]] board: Ploča koja se pokušava paralelno riješiti.
     :param dict cache: Keš koji čuva sve dozvoljenje vrijednosti za svaku praznu ćeliju.
     :param int size: Veličina ploče koje se riješava.
+    :param int split_factor: Koliko podploča se pravi po procesu.
+    :param SolveStats stats: Ako je zadat, svaki proces vraća statistiku svoje grane; statistike grana koje su
+    završile prije rješenja se dodaju u stats.workers i sabiraju u stats, a vrijeme podjele ide u candidate_time.
     :return: Urađena ploča ako postoji, u suprotnom None
     """
-    possible_boards = generate_possible_boards(board, size)
-    partial_parallel_solve = partial(parallel_solve_return, cache=cache, size=size)  # ovako uradjeno jer
-    # metoda map u parelelnom dijelu ne prima argumente za proslijedjene fije
-    with Pool(processes=cpu_count()) as pool:  # Koristi maksimalan broj procesa
-        results = pool.map(partial_parallel_solve, possible_boards)
-
-    for success, solved_board in results:
-        if success:
-            print("Rješenje je pronađeno!")
-            sudokutools.print_board(solved_board, size)
-            # board = copy.deepcopy(solved_board)
-            return solved_board
+    start_time = time.perf_counter() if stats is not None else 0.0
+    possible_boards = split_frontier(board, size, split_factor * cpu_count(), cache)
+    if stats is not None:
+        stats.candidate_time += time.perf_counter() - start_time
+    if len(possible_boards) == 1 and sudokutools.find_empty(possible_boards[0], size) is None:
+        if stats is not None:
+            stats.solved = True
+        return possible_boards[0]
+
+    pool = get_pool()
+    count = len(possible_boards)
+    shm = shared_boards.create_block(possible_boards, size, cache)
+    partial_parallel_solve = partial(parallel_solve_shared, name=shm.name, count=count, size=size,
+                                     generation=_generation.value, collect=stats is not None)  # ovako uradjeno jer
+    # metoda imap_unordered u parelelnom dijelu ne prima argumente za proslijedjene fije
+    try:
+        for index, success, worker_stats in pool.imap_unordered(partial_parallel_solve, range(count), chunksize=1):
+            if worker_stats is not None:
+                stats.workers.append(worker_stats)
+                stats.merge(worker_stats)
+            if success:
+                solved_board = possible_boards[index]
+                shared_boards.read_board(shm.buf, size, count, index, solved_board)
+                print("Rješenje je pronađeno!")
+                sudokutools.print_board(solved_board, size)
+                return solved_board
+    finally:
+        _generation.value += 1  # otkazivanje grana koje se još izvršavaju ili čekaju u redu
+        shm.close()
+        shm.unlink()
 
     return None
 
 
-def parallel_solve_return(board, cache, size=3):
+def parallel_solve_shared(index, name, count, size=3, generation=None, collect=False):
     """
-    Metoda koja nam služi kao pomoćna metoda pri paralelnom izvršavanju, s obzirom da je ovo metoda koja poziva metodu
-    za rješavanje ploče koristeći optimizovani backtracking algoritam. U slučaju da je moguće riješiti ploču vraća
-    tu ploču i True vrijednost, u suprotnnom vraća False i None.
-    :param list[list[int]] board: Ploča koja se rješava u ovom slučaju parelelno.
-    :param dict cache: Keš koji čuva sve dozvoljenje vrijednosti za svaku praznu ćeliju.
+    Pomoćna metoda za paralelno rješavanje preko dijeljene memorije: proces se kači na blok name, rješava podploču
+    sa rednim brojem index direktno u bloku i vraća samo njen redni broj i oznaku uspjeha.
+    :param int index: Redni broj podploče u bloku.
+    :param str name: Ime bloka dijeljene memorije (shared_boards.create_block).
+    :param int count: Broj podploča u bloku.
     :param int size: Veličina ploče koja se rješava.
-    :return: U slučaju mogućeg rješenja vraća True i rješenu ploču, u suprtnom False i None
+    :param int generation: Redni broj paralelnog poziva kojem grana pripada; kada se zajednički brojač promijeni,
+    pretraga se prekida jer je rješenje već pronađeno u drugoj grani.
+    :param bool collect: Da li se vraća i statistika rješavanja grane.
+    :return: Trojka (index, True ako je podploča riješena, SolveStats grane ili None).
     """
-    if solve_with_cache(board, cache, size):
-        return True, board
-    else:
-        return False, None
-
-
-def solve_with_cache(board, cache, size=3):
+    stats = SolveStats() if collect else None
+    stop = None
+    if generation is not None and _generation is not None:
+        def stop():
+            return _generation.value != generation
+
+        if stop():
+            return index, False, stats  # poziv je već završen, blok možda više ne postoji
+    try:
+        shm, cache = shared_boards.attach(name, size)
+    except FileNotFoundError:
+        return index, False, stats
+    board = shared_boards.board_at(shm.buf, size, count, index)
+    return index, solve_with_cache(board, cache, size, propagate=True, stop=stop, stats=stats), stats
+
+
+def solve_with_cache(board, cache=None, size=3, mrv=True, propagate=False, counts=None, stop=None, stats=None):
     """
     Metoda koja se koristi za rješavanje sudoku ploče board. Ova metoda koristi keš cache, kako bi što prije došla do
     rješenja na osnovu dozvoljenih vrijednosti za svaku praznu ćeliju, gdje su te dozvoljene vrijednosti poređane po
-    učestanosti pojavljivanja. Prvo se pronalazi prvo prazno polje i za njega se pomoću ove metode pokušava naći validna
+    učestanosti pojavljivanja. Prvo se bira prazno polje i za njega se pomoću ove metode pokušava naći validna
     vrijdnost. U slučaju da naša ploča nema praznih polja vraća se True s obzirom da je onda ploča urađena i popunjena.
-    Za dozvoljenu vrijednost za praznu ćeliju (uzima se iz keša) se provjerava da li je validna i ako jeste upisuje se
-    na tablu. Metoda koristi rekurziju kako bi došla do finalne urađene sudoku ploče.U slučaju vrijednosti koja nije
-    validna za dato polje tj ako rekurzija vrati False vrijednost postvlja se dato poljena vrijednost 0 i rekurzijom se
-    vraćamo jedan korak unazad i ponavljamo postupak sve dok je to moguće.
+    Keš određuje samo redoslijed vrijednosti: da li je vrijednost još uvijek dozvoljena se čita iz živih kandidata
+    stanja ploče, koji se inkrementalno ažuriraju pri svakom upisu i poništavaju kroz trag pri povratku unazad, pa keš
+    ostaje nepromijenjen i ne mora se kopirati. Ako upis ostavi neko prazno polje bez kandidata, grana se odmah
+    odbacuje. Pretraga je iterativna (search.steps, eksplicitni stek), pa dubina nije ograničena dubinom rekurzije.
+    Sa mrv=True grana se po praznom polju sa najmanje dozvoljenih vrijednosti (minimum remaining values), što
+    drastično smanjuje broj pokušaja na teškim pločama. Sa mrv=False polja se popunjavaju red po red kao ranije.
+    Sa propagate=True prije pretrage i nakon svakog pokušaja se primjenjuju tehnike iz modula propagation (singlovi,
+    parovi, pointing/claiming), pa se lakše ploče rješavaju bez ijednog pokušaja.
     :param list[list[int]] board: Ploča koju je potrebno riješiti.
-    :param dict cache:  Keš koji čuva sve dozvoljenje vrijednosti za svaku praznu ćeliju.
+    :param dict cache:  Keš sa redoslijedom dozvoljenih vrijednosti za prazne ćelije; bez keša redoslijed je rastući.
     :param int size: Veličina ploče koja se rješava.
+    :param bool mrv: Da li se grana po polju sa najmanje dozvoljenih vrijednosti.
+    :param bool propagate: Da li se koristi propagacija ograničenja.
+    :param dict counts: Brojač iz propagation.new_counts() koji bilježi koliko je koja tehnika uradila.
+    :param stop: Funkcija bez argumenata koja se poziva u svakom čvoru pretrage; ako vrati True pretraga se prekida i
+    metoda vraća False (koristi se za otkazivanje paralelnih grana).
+    :param SolveStats stats: Statistika koja se popunjava (upisi, povratci, dubina, tehnike propagacije i vremena);
+    bez nje se ništa ne mjeri. Kada je uključeno praćenje (tracing), uzorkovani pozivi bilježe span-ove za računanje
+    kandidata i pretragu, kao i brojače pretrage i propagacije, i bez zadate statistike.
     :return: True ako postoji rješenje, u suprtonom False
     """
-    global broj_pokusaja
-    # global start_vreme
-    # start_vreme = time.time()
-
-    blank = sudokutools.find_empty(board, size)
-    if not blank:
-        return True
-    else:
-        row, col = blank
-
-    # cache = orded_valid_values(board, cache, size)
-    for value in cache[(row, col)]:
-        if sudokutools.valid(board, blank, value, size):
-            board[row][col] = value
-            broj_pokusaja += 1
+    if stats is None and not tracing.is_enabled():
+        return _solve(board, cache, size, mrv, propagate, counts, stop)
+    with tracing.span("solve_with_cache", size=size, mrv=mrv, propagate=propagate) as trace:
+        if stats is None:
+            if not trace:
+                return _solve(board, cache, size, mrv, propagate, counts, stop)  # poziv nije uzorkovan
+            stats = SolveStats()
+        solved = _solve_with_stats(board, cache, size, mrv, propagate, counts, stop, stats)
+        if trace:
+            trace.counter("search", tries=stats.tries, backtracks=stats.backtracks, max_depth=stats.max_depth)
+            trace.counter("propagation", **stats.techniques)
+    return solved
+
+
+def _solve(board, cache, size, mrv, propagate, counts, stop):
+    """
+    Rješavanje bez mjerenja (solve_with_cache bez statistike i praćenja).
+    """
+    state = BoardState(board, size, mrv=mrv)
+    return state.consistent and search.run(state, search.mrv if mrv else search.row_major,
+                                           partial(_try_values, cache=cache or {}), propagate, counts, stop)[0]
 
-            if solve_with_cache(board, cache, size):
-                return True
 
-            board[row][col] = 0
-    return False
+def _solve_with_stats(board, cache, size, mrv, propagate, counts, stop, stats):
+    """
+    Rješavanje koje popunjava stats; računanje kandidata i pretraga su posebni span-ovi za tracing.
+    """
+    with tracing.span("candidates"):
+        start_time = time.perf_counter()
+        state = BoardState(board, size, mrv=mrv)
+        stats.candidate_time += time.perf_counter() - start_time
+    if not state.consistent:
+        stats.solved = False
+        return False
+    techniques = propagation.new_counts()
+    with tracing.span("search"):
+        solved = search.run(state, search.mrv if mrv else search.row_major, partial(_try_values, cache=cache or {}),
+                            propagate, techniques, stop, stats)[0]
+    for technique, count in techniques.items():
+        stats.techniques[technique] += count
+        if counts is not None:
+            counts[technique] += count
+    return solved
+
+
+def _try_values(state, idx, cache):
+    """
+    Generator vrijednosti za ćeliju idx redoslijedom iz keša, koje su u trenutku upita i dalje među živim kandidatima.
+    Za ćeliju koje nema u kešu redoslijed je rastući.
+    :param BoardState state: Stanje ploče koja se rješava.
+    :param int idx: Indeks prazne ćelije.
+    :param dict cache: Keš sa redoslijedom dozvoljenih vrijednosti.
+    :return: Dozvoljene vrijednosti ćelije.
+    """
+    cands = state.cands
+    order = cache.get((state.cell_row[idx], state.cell_col[idx]))
+    if order is None:
+        order = mask_to_values(cands[idx])
+    for value in order:
+        if cands[idx] & (1 << (value - 1)):
+            yield value
 
 
 def orded_valid_values(board, cache, size=3):
@@ -219,102 +392,52 @@ def orded_valid_values(board, cache, size=3):
     :param int size: Veličina ploče koja se riješava.
     :return: Keš poredan po učestanostima dozvoljenih vrijednosti koje se mogu javiti u praznim poljima.
     """
-    cache_priority = dict()
-    count_appearance_row = [dict() for i in range(size**2)]
-    count_appearance_col = [dict() for i in range(size**2)]
-    count_appearance_block = [dict() for i in range(size**2)]
-
-    for row in range(size**2):
-        temp_list = list()
-
-        # Iterate through the columns of a row and count appearance of numbers
-        # within the cache
-        for col in range(size**2):
-            if (row, col) in cache.keys():
-                for value in cache[(row, col)]:
-                    temp_list.append(value)
-        temp_set = set(temp_list)
-        for number in temp_set:
-            count_appearance_row[row][number] = temp_list.count(number)
-
-    for col in range(size**2):
-        temp_list = list()
-
-        # Iterate through the rows of a column and count appearance of numbers
-        # within the cache
-        for row in range(size**2):
-            if (row, col) in cache.keys():
-                for value in cache[(row, col)]:
-                    temp_list.append(value)
-        temp_set = set(temp_list)
-        for number in temp_set:
-            count_appearance_col[col][number] = temp_list.count(number)
-
-    # Iterate through the 9 different blocks of the board and count
-    # appearance of numbers within the cache
-    row_block_start = 0
-    col_block_start = 0
-    block_number = 0
-    while True:
-        row_block_end = row_block_start + size
-        col_block_end = col_block_start + size
-        temp_list = list()
-
-        for row in range(row_block_start, row_block_end):
-            for col in range(col_block_start, col_block_end):
-                if (row, col) in cache.keys():
-                    for value in cache[(row, col)]:
-                        temp_list.append(value)
-
-        temp_set = set(temp_list)
-        for number in temp_set:
-            count_appearance_block[block_number][number] = temp_list.count(number)
-
-        if row_block_start == size**2-size and col_block_start == size**2-size:
-            # jer size**2 - size predstavlja posljedni blok
-            break
-        elif col_block_start == size**2-size:
-            row_block_start += size
-            col_block_start = 0
-        else:
-            col_block_start += size
-        block_number += 1
-
-    for row in range(size**2):
-        for col in range(size**2):
-            temp_list = list()
-            block_number = (row // size) * size + col // size  # određivanje bloka na osnovu indeksa reda i kolone
-            if (row, col) in cache.keys():
-                for value in cache[(row, col)]:
-                    freq = count_appearance_row[row][value] + count_appearance_col[col][value] + \
-                           count_appearance_block[block_number][value]
-                    temp_list.append(freq)
-                cache_priority[(row, col)] = temp_list  # keš sa učestanostima sa određeno prazno polje, vrijednosti i
-                # ucestanosti se povezuje preko zip metode
-
-    # upisivanje vrijednosti koje se javalju samo jednom
-    values_found = True
-    while values_found:
-        old_board = copy.deepcopy(board)
-        for row in range(size**2):
-            for col in range(size**2):
-                temp_list = list()
-                block_number = (row // size) * size + col // size
-                if (row, col) in cache.keys():
-                    for value in cache[(row, col)]:
-                        if count_appearance_row[row][value] == 1 or count_appearance_col[col][value] == 1 or \
-                                count_appearance_block[block_number][value] == 1:
-                            board[row][col] = value
-                            # return True
-        values_found = any(old != new for oldRow, newRow in zip(old_board, board) for old, new in zip(oldRow, newRow))
-        # uslov za izlazak iz petlje ako postoji bilo koja vrijednost na staroj ploči koja je različita od vrijednosti
-        # na novoj ploči na odgovarajućoj poziciji
-
-    for row in range(size**2):
-        for col in range(size**2):
-            if (row, col) in cache.keys():
-                cache[(row, col)] = [i for _, i in sorted(zip(cache_priority[(row, col)], cache[(row, col)]))]
-                # sorted po default uzima 0-tu kolonu i sortira u rastućem redoslijedu
+    with tracing.span("orded_valid_values", size=size) as trace:
+        if not trace:
+            return _orded_valid_values(board, cache, size)
+        blanks = len(cache)
+        _orded_valid_values(board, cache, size)
+        filled = sum(1 for row, col in cache if board[row][col])
+        trace.counter("orded_valid_values", cells=blanks, filled=filled)
+    return cache
+
+
+def _orded_valid_values(board, cache, size):
+    """
+    Poredak keša i upis vrijednosti koje se javljaju samo jednom (bez praćenja), vidi orded_valid_values.
+
+    Učestanosti se računaju u jednom prolazu kroz keš, u nizove brojača (jedan red brojača po redu, koloni i bloku,
+    indeksiran vrijednošću), umjesto privremenih lista i list.count za svaku vrijednost svake jedinice. Učestanosti
+    se računaju nad kandidatima iz keša i ne mijenjaju se upisom, pa je upis vrijednosti koje se javljaju samo jednom
+    jedan prolaz (ponovljeni prolaz bi upisao iste vrijednosti) i ploča se ne kopira.
+    """
+    n = size**2
+    stride = n + 1  # brojač vrijednosti value jedinice unit je na indeksu unit * stride + value
+    row_counts = [0] * (n * stride)
+    col_counts = [0] * (n * stride)
+    block_counts = [0] * (n * stride)
+    cells = []
+    for (row, col), values in cache.items():
+        row_base = row * stride
+        col_base = col * stride
+        block_base = ((row // size) * size + col // size) * stride
+        cells.append((row, col, values, row_base, col_base, block_base))
+        for value in values:
+            row_counts[row_base + value] += 1
+            col_counts[col_base + value] += 1
+            block_counts[block_base + value] += 1
+
+    for row, col, values, row_base, col_base, block_base in cells:
+        priority = []
+        for value in values:
+            in_row = row_counts[row_base + value]
+            in_col = col_counts[col_base + value]
+            in_block = block_counts[block_base + value]
+            if in_row == 1 or in_col == 1 or in_block == 1:
+                board[row][col] = value  # vrijednost koja se javlja samo jednom u redu/koloni/bloku
+            priority.append(in_row + in_col + in_block)
+        cache[(row, col)] = [value for _, value in sorted(zip(priority, values))]
+        # sorted po default uzima 0-tu kolonu i sortira u rastućem redoslijedu
     return cache
 
 
@@ -326,7 +449,6 @@ if __name__ == "__main__":
     cache = orded_valid_values(board, cache, 3)
     # solve_with_cache(board, cache, 3)
     # sudokutools.print_board(board, 3)
-    # print(broj_pokusaja)
     # print(f"Vrijeme izvršavanja: {(time.time() - start_time) * 1000} ms.")
     # regulartime = timeit.timeit('solve_with_cache(board, cache, 4)', globals=globals(), number=50)
     # parallel_time = timeit.timeit('parallel_solver(board, cache, 4)', globals=globals(), number=50)
@@ -0,0 +1,243 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+from board_state import unit_tables
+
+# Tehnike po redoslijedu primjene; jeftinije tehnike se uvijek iscrpe prije skupljih.
+TECHNIQUES = ("naked_single", "hidden_single", "naked_pair", "hidden_pair", "pointing", "claiming")
+
+
+def new_counts():
+    """
+    Metoda za prazan brojač tehnika propagacije.
+
+    Returns:
+        dict: Za svaku tehniku iz TECHNIQUES broj 0. Kod singlova se broje upisana polja, a kod parova i
+        pointing/claiming tehnika broj uklonjenih kandidata.
+    """
+    return {technique: 0 for technique in TECHNIQUES}
+
+
+def propagate(state, counts=None):
+    """
+    Primjena tehnika naked single, hidden single, naked pair, hidden pair, pointing i claiming dok god neka od njih
+    napravi izmjenu (fixpoint). Nakon svake izmjene kreće se ponovo od najjeftinije tehnike. Sve izmjene se rade kroz
+    state.assign i state.eliminate, pa ih poziv state.undo(mark) u potpunosti poništava.
+
+    Args:
+        state (BoardState): Stanje ploče nad kojim se radi propagacija.
+        counts (dict|None): Brojač iz new_counts() koji se uvećava za svaku tehniku, ili None.
+
+    Returns:
+        bool: False ako je pronađena kontradikcija, True u suprotnom.
+    """
+    n = state.n
+    full = state.full_mask
+    values, cands = state.values, state.cands
+    units = unit_tables(state.size)
+
+    while True:
+        # naked single: prazna ćelija sa samo jednim kandidatom
+        progress = 0
+        if state.mrv:  # kante po broju kandidata direktno daju ćelije sa 0 i 1 kandidatom
+            if state.buckets[0]:
+                return False
+            singles = state.buckets[1]
+            while singles:
+                idx = next(iter(singles))
+                if not state.assign(idx, cands[idx].bit_length()):
+                    return False
+                progress += 1
+        else:
+            for idx in range(n * n):
+                if not values[idx]:
+                    mask = cands[idx]
+                    if not mask:
+                        return False
+                    if not mask & (mask - 1):
+                        if not state.assign(idx, mask.bit_length()):
+                            return False
+                        progress += 1
+        if progress:
+            if counts is not None:
+                counts["naked_single"] += progress
+            continue
+
+        # hidden single: vrijednost koja u jedinici može stati samo u jednu ćeliju
+        for unit in units:
+            once = twice = placed = 0
+            for idx in unit:
+                mask = cands[idx]
+                if values[idx]:
+                    placed |= mask
+                else:
+                    twice |= once & mask
+                    once |= mask
+            if once | placed != full:
+                return False  # neka vrijednost ne može stati nigdje u jedinici
+            singles = once & ~twice & ~placed
+            while singles:
+                bit = singles & -singles
+                singles ^= bit
+                for idx in unit:
+                    if not values[idx] and cands[idx] & bit:
+                        if not state.assign(idx, bit.bit_length()):
+                            return False
+                        progress += 1
+                        break
+        if progress:
+            if counts is not None:
+                counts["hidden_single"] += progress
+            continue
+
+        for technique, apply in (("naked_pair", _naked_pairs), ("hidden_pair", _hidden_pairs),
+                                 ("pointing", _pointing), ("claiming", _claiming)):
+            eliminated = apply(state, units)
+            if eliminated < 0:
+                return False
+            if eliminated:
+                if counts is not None:
+                    counts[technique] += eliminated
+                break
+        else:
+            return True
+
+
+def _naked_pairs(state, units):
+    """
+    Naked pair: dvije ćelije jedinice sa istim parom kandidata; ti kandidati se uklanjaju iz ostatka jedinice.
+
+    Returns:
+        int: Broj uklonjenih kandidata, ili -1 ako je pronađena kontradikcija.
+    """
+    values, cands = state.values, state.cands
+    eliminated = 0
+    for unit in units:
+        seen = dict()
+        for idx in unit:
+            mask = cands[idx]
+            if values[idx] or mask.bit_count() != 2:
+                continue
+            if mask not in seen:
+                seen[mask] = idx
+                continue
+            pair = (seen[mask], idx)
+            for other in unit:
+                if not values[other] and other not in pair:
+                    removed = state.eliminate(other, mask)
+                    if removed < 0:
+                        return -1
+                    eliminated += removed
+    return eliminated
+
+
+def _hidden_pairs(state, units):
+    """
+    Hidden pair: dvije vrijednosti koje u jedinici mogu stati samo u iste dvije ćelije; ostali kandidati tih ćelija
+    se uklanjaju.
+
+    Returns:
+        int: Broj uklonjenih kandidata, ili -1 ako je pronađena kontradikcija.
+    """
+    values, cands = state.values, state.cands
+    eliminated = 0
+    for unit in units:
+        positions = dict()  # bit vrijednosti -> bitmaska pozicija u jedinici gdje vrijednost može stati
+        for k, idx in enumerate(unit):
+            if values[idx]:
+                continue
+            mask = cands[idx]
+            while mask:
+                bit = mask & -mask
+                mask ^= bit
+                positions[bit] = positions.get(bit, 0) | (1 << k)
+
+        pairs = dict()  # bitmaska dvije pozicije -> bitovi vrijednosti koje mogu stati samo tu
+        for bit, where in positions.items():
+            if where.bit_count() == 2:
+                pairs[where] = pairs.get(where, 0) | bit
+        for where, bits in pairs.items():
+            if bits.bit_count() != 2:
+                continue
+            while where:
+                low = where & -where
+                where ^= low
+                removed = state.eliminate(unit[low.bit_length() - 1], ~bits)
+                if removed < 0:
+                    return -1
+                eliminated += removed
+    return eliminated
+
+
+def _locked_candidates(state, inner_units, inner_key, outer_key, outer_units):
+    """
+    Zajednička logika za pointing i claiming: ako su sva mjesta neke vrijednosti unutar jedinice iz inner_units
+    (npr. bloka) u istoj jedinici tipa outer (npr. redu), vrijednost se uklanja iz ostatka te outer jedinice.
+
+    Returns:
+        int: Broj uklonjenih kandidata, ili -1 ako je pronađena kontradikcija.
+    """
+    values, cands = state.values, state.cands
+    eliminated = 0
+    for unit in inner_units:
+        inner = inner_key[unit[0]]
+        free = 0
+        for idx in unit:
+            if not values[idx]:
+                free |= cands[idx]
+        while free:
+            bit = free & -free
+            free ^= bit
+            outer = -1
+            for idx in unit:
+                if not values[idx] and cands[idx] & bit:
+                    if outer == -1:
+                        outer = outer_key[idx]
+                    elif outer != outer_key[idx]:
+                        outer = -2
+                        break
+            if outer < 0:
+                continue
+            for other in outer_units[outer]:
+                if not values[other] and inner_key[other] != inner and cands[other] & bit:
+                    removed = state.eliminate(other, bit)
+                    if removed < 0:
+                        return -1
+                    eliminated += removed
+    return eliminated
+
+
+def _pointing(state, units):
+    """
+    Pointing: sva mjesta vrijednosti u bloku su u istom redu ili koloni, pa se ona uklanja iz ostatka tog reda/kolone.
+
+    Returns:
+        int: Broj uklonjenih kandidata, ili -1 ako je pronađena kontradikcija.
+    """
+    n = state.n
+    rows, cols, boxes = units[:n], units[n:2 * n], units[2 * n:]
+    by_row = _locked_candidates(state, boxes, state.cell_box, state.cell_row, rows)
+    if by_row < 0:
+        return -1
+    by_col = _locked_candidates(state, boxes, state.cell_box, state.cell_col, cols)
+    if by_col < 0:
+        return -1
+    return by_row + by_col
+
+
+def _claiming(state, units):
+    """
+    Claiming (box/line reduction): sva mjesta vrijednosti u redu ili koloni su u istom bloku, pa se ona uklanja iz
+    ostatka tog bloka.
+
+    Returns:
+        int: Broj uklonjenih kandidata, ili -1 ako je pronađena kontradikcija.
+    """
+    n = state.n
+    rows, cols, boxes = units[:n], units[n:2 * n], units[2 * n:]
+    by_row = _locked_candidates(state, rows, state.cell_row, state.cell_box, boxes)
+    if by_row < 0:
+        return -1
+    by_col = _locked_candidates(state, cols, state.cell_col, state.cell_box, boxes)
+    if by_col < 0:
+        return -1
+    return by_row + by_col
@@ -0,0 +1,199 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+import batch_solver
+from flat_board import BLANKS, SYMBOLS, FlatBoard
+from collections import deque
+import csv
+from itertools import chain
+import sys
+import time
+
+_SIZE_BY_LENGTH = {size**4: size for size in (3, 4, 5, 6)}
+
+
+def parse_puzzle(text, size=None):
+    """
+    Metoda za pretvaranje tekstualnog zapisa slagalice u ploču. Zapis je niz od size**4 znakova red po red, gdje je
+    prazno polje '.' ili '0', vrijednosti 10-35 se pišu slovima A-Z (mala ili velika), a 36 znakom '@'.
+
+    Args:
+        text (str): Zapis slagalice (81 znak za 9x9, 256 za 16x16, 625 za 25x25, 1296 za 36x36).
+        size (int|None): Veličina slagalice; ako je None određuje se iz dužine zapisa.
+
+    Returns:
+        list[list[int]]: Ploča kao lista listi int vrijednosti.
+
+    Raises:
+        ValueError: Ako dužina ili znakovi zapisa nisu ispravni.
+    """
+    text = text.strip()
+    if size is None:
+        if len(text) not in _SIZE_BY_LENGTH:
+            raise ValueError("Neispravna dužina zapisa slagalice: {}".format(len(text)))
+        size = _SIZE_BY_LENGTH[len(text)]
+    n = size**2
+    if len(text) != n * n:
+        raise ValueError("Zapis slagalice veličine {} mora imati {} znakova".format(size, n * n))
+
+    values = []
+    for char in text.upper():
+        if char in BLANKS:
+            values.append(0)
+        else:
+            value = SYMBOLS.find(char) + 1
+            if not 0 < value <= n:
+                raise ValueError("Neispravan znak u zapisu slagalice: {!r}".format(char))
+            values.append(value)
+    return [values[i * n:(i + 1) * n] for i in range(n)]
+
+
+def format_puzzle(board, size=3, blank="."):
+    """
+    Metoda za pretvaranje ploče u tekstualni zapis od size**4 znakova, inverzna metodi parse_puzzle.
+
+    Args:
+        board (list[list[int]]): Ploča kao lista listi int vrijednosti.
+        size (int): Veličina slagalice; podrazumijevana vrijednost je 3.
+        blank (str): Znak za prazno polje, '.' ili '0'.
+
+    Returns:
+        str: Zapis slagalice.
+    """
+    if isinstance(board, FlatBoard):
+        return board.to_string(blank)
+    symbols = blank + SYMBOLS
+    return "".join(symbols[value] for row in board for value in row)
+
+
+def _is_csv(path, fmt):
+    """
+    Metoda koja određuje da li se fajl čita/piše kao CSV, na osnovu zadatog formata ili ekstenzije.
+    """
+    return (fmt or path.rsplit(".", 1)[-1].lower()) == "csv"
+
+
+def read_puzzles(path, size=None, fmt=None, with_solutions=False):
+    """
+    Generator koji čita slagalice iz fajla jednu po jednu, pa i fajlovi od više gigabajta zauzimaju konstantnu
+    memoriju. Podržani formati:
+        - linijski (.txt, .sdm, ...): jedna slagalica po liniji; prazne linije i linije koje počinju sa '#' se
+          preskaču, kao i sve poslije prvog razmaka (komentar iza zapisa).
+        - CSV (.csv): prva kolona je slagalica, opciono druga kolona rješenje; zaglavlje se prepoznaje i preskače.
+
+    Args:
+        path (str): Putanja do fajla.
+        size (int|None): Veličina slagalica; ako je None određuje se iz dužine svakog zapisa.
+        fmt (str|None): "csv" ili "lines"; ako je None određuje se iz ekstenzije fajla.
+        with_solutions (bool): Ako je True vraćaju se parovi (ploča, rješenje), gdje je rješenje None ako ga fajl
+         ne sadrži.
+
+    Returns:
+        Generator ploča, odnosno parova (ploča, rješenje).
+    """
+    with open(path, encoding="utf-8", newline="") as file:
+        if _is_csv(path, fmt):
+            for number, fields in enumerate(csv.reader(file)):
+                if not fields or not fields[0].strip():
+                    continue
+                try:
+                    board = parse_puzzle(fields[0], size)
+                except ValueError:
+                    if number == 0:
+                        continue  # zaglavlje, npr. "quizzes,solutions"
+                    raise
+                if with_solutions:
+                    solution = parse_puzzle(fields[1], size) if len(fields) > 1 and fields[1].strip() else None
+                    yield board, solution
+                else:
+                    yield board
+        else:
+            for line in file:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                board = parse_puzzle(line.split()[0], size)
+                yield (board, None) if with_solutions else board
+
+
+def write_puzzles(path, boards, size=3, fmt=None, solutions=None, blank="."):
+    """
+    Metoda za upis slagalica u fajl, jedna po jedna, tako da ulaz može biti generator proizvoljne dužine.
+
+    Args:
+        path (str): Putanja do fajla.
+        boards: Lista ili iterator ploča.
+        size (int): Veličina slagalica; podrazumijevana vrijednost je 3.
+        fmt (str|None): "csv" ili "lines"; ako je None određuje se iz ekstenzije fajla.
+        solutions: Opciona lista ili iterator rješenja istim redoslijedom kao boards (samo za CSV); rješenje može
+         biti None.
+        blank (str): Znak za prazno polje, '.' ili '0'.
+
+    Returns:
+        int: Broj upisanih slagalica.
+    """
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        if _is_csv(path, fmt):
+            writer = csv.writer(file)
+            writer.writerow(["puzzle", "solution"])
+            solutions = iter(solutions) if solutions is not None else None
+            for board in boards:
+                solution = next(solutions) if solutions is not None else None
+                writer.writerow([format_puzzle(board, size, blank),
+                                 format_puzzle(solution, size, blank) if solution is not None else ""])
+                count += 1
+        else:
+            for board in boards:
+                file.write(format_puzzle(board, size, blank) + "\n")
+                count += 1
+    return count
+
+
+def solve_file(in_path, out_path, size=None, processes=None, chunksize=256):
+    """
+    Metoda koja čita slagalice iz fajla in_path, rješava ih paketno (batch_solver.solve_batch) i upisuje parove
+    slagalica/rješenje u CSV fajl out_path. Čitanje, rješavanje i upis su protočni, pa se obrađuju i fajlovi veći od
+    raspoložive memorije.
+
+    Args:
+        in_path (str): Ulazni fajl u bilo kojem formatu koji podržava read_puzzles.
+        out_path (str): Izlazni CSV fajl.
+        size (int|None): Veličina slagalica; ako je None određuje se iz prvog zapisa.
+        processes (int|None): Broj procesa, kao kod solve_batch.
+        chunksize (int): Broj slagalica u jednom paketu.
+
+    Returns:
+        int: Broj obrađenih slagalica.
+    """
+    puzzles = read_puzzles(in_path, size)
+    first = next(puzzles, None)
+    if first is None:
+        return write_puzzles(out_path, [], size or 3, fmt="csv")
+    size = size or _SIZE_BY_LENGTH[len(first) ** 2]
+
+    originals = deque()  # solve_batch rješava na mjestu, pa se zapis slagalice pamti prije slanja na rješavanje
+
+    def remember(boards):
+        for board in boards:
+            originals.append(format_puzzle(board, size))
+            yield board
+
+    solutions = batch_solver.solve_batch(remember(chain([first], puzzles)), size, processes, chunksize)
+    count = 0
+    with open(out_path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["puzzle", "solution"])
+        for solution in solutions:
+            writer.writerow([originals.popleft(),
+                             format_puzzle(solution, size) if solution is not None else ""])
+            count += 1
+    return count
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Upotreba: python puzzle_io.py ulaz.txt izlaz.csv")
+        sys.exit(1)
+    start_time = time.time()
+    solved = solve_file(sys.argv[1], sys.argv[2])
+    print("Solved {} puzzles in {:.2f} s".format(solved, time.time() - start_time))
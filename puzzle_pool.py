@@ -0,0 +1,149 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+from flat_board import copy_board
+import optimized_backtracking as ob
+import puzzle_io
+import sudokutools
+from multiprocessing import Process
+import os
+import sys
+import uuid
+
+# Podrazumijevani direktorijum pool-a, pored izvornog koda; za svaku veličinu i težinu postoji poddirektorijum.
+POOL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "puzzle_pool")
+# Broj slagalica koje refill drži spremnim za svaku veličinu i težinu.
+TARGET = 5
+# Težine koje GUI nudi za svaku veličinu.
+DIFFICULTIES = {3: (0, 1, 2), 4: (0, 1, 2), 5: (0, 1, 2), 6: (0, 1, 2)}
+
+_refill_processes = dict()  # veličina -> proces koji dopunjava pool te veličine
+
+
+def _pool_path(size, difficulty, directory):
+    return os.path.join(directory, "{}_{}".format(size, difficulty))
+
+
+def pool_count(size, difficulty, directory=POOL_DIR):
+    """
+    Metoda koja vraća broj spremnih slagalica za zadatu veličinu i težinu.
+    """
+    path = _pool_path(size, difficulty, directory)
+    if not os.path.isdir(path):
+        return 0
+    return sum(1 for name in os.listdir(path) if name.endswith(".sdk"))
+
+
+def push_puzzle(size, difficulty, board, solution, directory=POOL_DIR):
+    """
+    Metoda za dodavanje slagalice i njenog rješenja u pool. Svaka slagalica je zaseban fajl koji se prvo upiše pod
+    privremenim imenom pa se atomski preimenuje, tako da pop_puzzle iz drugog procesa nikada ne vidi nedovršen zapis.
+
+    Args:
+        size (int): Veličina slagalice.
+        difficulty (int): Težina slagalice, kao kod sudokutools.generate_board.
+        board (list[list[int]]): Slagalica.
+        solution (list[list[int]]): Rješenje slagalice.
+        directory (str): Direktorijum pool-a.
+
+    Returns:
+        None.
+    """
+    path = _pool_path(size, difficulty, directory)
+    os.makedirs(path, exist_ok=True)
+    name = os.path.join(path, uuid.uuid4().hex)
+    with open(name + ".tmp", "w", encoding="utf-8") as file:
+        file.write("{},{}\n".format(puzzle_io.format_puzzle(board, size), puzzle_io.format_puzzle(solution, size)))
+    os.replace(name + ".tmp", name + ".sdk")
+
+
+def pop_puzzle(size, difficulty, directory=POOL_DIR):
+    """
+    Metoda za uzimanje jedne slagalice iz pool-a. Fajl se prvo atomski preimenuje, pa ga dva procesa ne mogu uzeti
+    istovremeno, a zatim se čita i briše.
+
+    Args:
+        size (int): Veličina slagalice.
+        difficulty (int): Težina slagalice.
+        directory (str): Direktorijum pool-a.
+
+    Returns:
+        tuple|None: Par (slagalica, rješenje), ili None ako je pool prazan.
+    """
+    path = _pool_path(size, difficulty, directory)
+    if not os.path.isdir(path):
+        return None
+    for name in os.listdir(path):
+        if not name.endswith(".sdk"):
+            continue
+        taken = os.path.join(path, name[:-4] + ".taken")
+        try:
+            os.replace(os.path.join(path, name), taken)
+        except OSError:
+            continue  # fajl je u međuvremenu uzeo drugi proces
+        with open(taken, encoding="utf-8") as file:
+            puzzle, solution = file.read().strip().split(",")
+        os.remove(taken)
+        return puzzle_io.parse_puzzle(puzzle, size), puzzle_io.parse_puzzle(solution, size)
+    return None
+
+
+def generate_puzzle(size=3, difficulty=0):
+    """
+    Metoda za generisanje slagalice sa jedinstvenim rješenjem zajedno sa njenim rješenjem.
+
+    Returns:
+        tuple: Par (slagalica, rješenje).
+    """
+    board = sudokutools.generate_board(size, difficulty, unique=True)
+    solution = copy_board(board)
+    ob.solve_with_cache(solution, None, size, propagate=True)
+    return board, solution
+
+
+def refill(difficulties=None, target=TARGET, directory=POOL_DIR):
+    """
+    Metoda koja dopunjava pool do target slagalica za svaku veličinu i težinu. Prvo se popunjava najpraznija
+    kombinacija, tako da se nakon uzimanja slagalice ona prva nadoknadi.
+
+    Args:
+        difficulties (dict|None): Veličina -> težine; podrazumijevano DIFFICULTIES.
+        target (int): Broj slagalica po veličini i težini.
+        directory (str): Direktorijum pool-a.
+
+    Returns:
+        int: Broj generisanih slagalica.
+    """
+    keys = [(size, difficulty) for size, levels in (difficulties or DIFFICULTIES).items() for difficulty in levels]
+    generated = 0
+    while True:
+        counts = {key: pool_count(key[0], key[1], directory) for key in keys}
+        key = min(keys, key=counts.get)
+        if counts[key] >= target:
+            return generated
+        push_puzzle(key[0], key[1], *generate_puzzle(*key), directory=directory)
+        generated += 1
+
+
+def start_refill(difficulties=None, target=TARGET, directory=POOL_DIR):
+    """
+    Metoda koja pokreće refill u pozadinskim procesima, tako da generisanje ne blokira GUI. Svaka veličina ima svoj
+    proces, pa sporo generisanje jedinstvenih 25x25 i 36x36 slagalica ne zadržava dopunu 9x9 i 16x16 pool-ova iz
+    kojih GUI najčešće uzima. Za veličinu čiji je prethodni refill još uvijek aktivan novi se ne pokreće.
+
+    Returns:
+        list[multiprocessing.Process]: Procesi koji dopunjavaju pool, po jedan za svaku veličinu.
+    """
+    processes = []
+    for size, levels in (difficulties or DIFFICULTIES).items():
+        process = _refill_processes.get(size)
+        if process is None or not process.is_alive():
+            process = Process(target=refill, args=({size: levels}, target, directory), daemon=True)
+            process.start()
+            _refill_processes[size] = process
+        processes.append(process)
+    return processes
+
+
+if __name__ == "__main__":
+    target = int(sys.argv[1]) if len(sys.argv) > 1 else TARGET
+    print("Generated {} puzzles into {}".format(refill(target=target), POOL_DIR))
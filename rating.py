@@ -0,0 +1,139 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+from board_state import BoardState
+import propagation
+import search
+import solution_counter
+import sudokutools
+from functools import partial
+from multiprocessing import Pool
+import math
+import random
+import sys
+import time
+
+# Ocjena za svaku tehniku, istim redoslijedom kojim ih propagation.propagate primjenjuje (jeftinije prvo), pa je
+# tehnika sa najvećom ocjenom ujedno i najteža tehnika koja je bila potrebna.
+TECHNIQUE_SCORES = {"naked_single": 1.0,
+                    "hidden_single": 2.0,
+                    "naked_pair": 3.0,
+                    "hidden_pair": 4.0,
+                    "pointing": 5.0,
+                    "claiming": 5.5}
+# Slagalica koju tehnike ne mogu riješiti dobija SEARCH_SCORE + log2(broj pokušaja).
+SEARCH_SCORE = 7.0
+
+
+def rate(board, size=3):
+    """
+    Metoda za ocjenu težine slagalice. Slagalica se rješava ljudskim tehnikama (propagation.propagate), od najlakše
+    ka najtežoj, i pamti se najteža tehnika koja je bila potrebna. Ako tehnike nisu dovoljne, slagalica se dovršava
+    pretragom i broji se broj pokušaja. Ocjena je TECHNIQUE_SCORES najteže tehnike, odnosno
+    SEARCH_SCORE + log2(pokušaja) ako je bila potrebna pretraga. Ploča ostaje nepromijenjena.
+
+    Args:
+        board (list[list[int]]): Reprezentacija ploce dimenzija size x size predstavljene kao lista listi
+         od int vrijednosti.
+        size (int): Veličina sudoku slagalice; podrazumijevana vrijednost je 3.
+
+    Returns:
+        dict: "score" (float), "hardest" (naziv tehnike, "search" ili None), "techniques" (broj primjena svake
+        tehnike prije pretrage), "guesses" (broj pokušaja u pretrazi) i "solved" (da li slagalica ima rješenje).
+    """
+    counts = propagation.new_counts()
+    result = {"score": 0.0, "hardest": None, "techniques": counts, "guesses": 0, "solved": False}
+    state = BoardState(board, size, mrv=True)
+    if not state.consistent:
+        return result
+
+    mark = state.mark()
+    guesses = 0
+    if propagation.propagate(state, counts):  # tehnike koje su bile potrebne se broje samo prije pretrage
+        result["solved"], guesses = search.run(state, search.mrv, search.ascending, propagate=True)
+    state.undo(mark)
+
+    for technique in propagation.TECHNIQUES:
+        if counts[technique] and TECHNIQUE_SCORES[technique] > result["score"]:
+            result["hardest"] = technique
+            result["score"] = TECHNIQUE_SCORES[technique]
+    if guesses:
+        result["hardest"] = "search"
+        result["guesses"] = guesses
+        result["score"] = SEARCH_SCORE + math.log2(guesses)
+    return result
+
+
+def rate_batch(boards, size=3, processes=1, chunksize=64):
+    """
+    Metoda za ocjenu velikog broja slagalica; sa processes > 1 ocjenjivanje se raspoređuje po procesima u paketima
+    od po chunksize slagalica. Ocjene se vraćaju istim redoslijedom kao i slagalice.
+
+    Args:
+        boards: Lista ili iterator ploča.
+        size (int): Veličina slagalica.
+        processes (int): Broj procesa.
+        chunksize (int): Broj slagalica koje se odjednom šalju jednom procesu.
+
+    Returns:
+        Generator rezultata metode rate.
+    """
+    if processes == 1:
+        for board in boards:
+            yield rate(board, size)
+        return
+    with Pool(processes=processes) as pool:
+        yield from pool.imap(partial(rate, size=size), boards, chunksize)
+
+
+def generate_rated(size=3, band=(0.0, math.inf), rng=None, attempts=20):
+    """
+    Metoda za generisanje slagalice sa jedinstvenim rješenjem čija je ocjena u opsegu band. Polja popunjene ploče
+    se prazne jedno po jedno slučajnim redoslijedom, uz čuvanje jedinstvenosti rješenja; nakon svakog pražnjenja
+    slagalica se ocjenjuje, a polje čije bi pražnjenje podiglo ocjenu iznad opsega se vraća. Ako se opseg ne dostigne
+    (npr. sve ostale ćelije su neophodne), kreće se od nove ploče.
+
+    Args:
+        size (int): Veličina sudoku slagalice; podrazumijevana vrijednost je 3.
+        band (tuple[float, float]): Najmanja i najveća dozvoljena ocjena.
+        rng (random.Random|int|None): Generator slučajnih brojeva ili seed.
+        attempts (int): Najveći broj ploča koje se isprobavaju.
+
+    Returns:
+        tuple|None: Par (slagalica, rezultat metode rate), ili None ako slagalica nije pronađena.
+    """
+    if rng is None:
+        rng = random
+    elif isinstance(rng, int):
+        rng = random.Random(rng)
+    low, high = band
+    n = size**2
+
+    for _ in range(attempts):
+        board = sudokutools.generate_solution(size, rng)
+        cells = [(row, col) for row in range(n) for col in range(n)]
+        rng.shuffle(cells)
+        for row, col in cells:
+            value = board[row][col]
+            board[row][col] = 0
+            if not solution_counter.is_unique_without(board, row, col, value, size):
+                board[row][col] = value
+                continue
+            result = rate(board, size)
+            if result["score"] > high:
+                board[row][col] = value  # preteško, polje ostaje popunjeno
+            elif result["score"] >= low:
+                return board, result
+    return None
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    puzzles = [sudokutools.generate_board(size, 2, rng=seed, unique=True) for seed in range(100)]
+    start_time = time.time()
+    ratings = list(rate_batch(puzzles, size))
+    end_time = time.time()
+    for hardest in [None] + list(propagation.TECHNIQUES) + ["search"]:
+        count = sum(1 for result in ratings if result["hardest"] == hardest)
+        if count:
+            print("{:<14} {}".format(str(hardest), count))
+    print("Rated {} puzzles, {:.1f} puzzles/s".format(len(ratings), len(ratings) / (end_time - start_time)))
@@ -0,0 +1,156 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+from board_state import mask_to_values
+import propagation
+import time
+
+# Događaji koje vraća steps: (događaj, indeks ćelije, vrijednost).
+PLACE = "place"      # vrijednost je upisana i stanje je i dalje konzistentno
+REJECT = "reject"    # upis ili propagacija nakon njega su doveli do kontradikcije (upis je već poništen)
+UNDO = "undo"        # ranije upisana vrijednost se poništava (povratak unazad)
+SOLVED = "solved"    # ploča je riješena; nastavkom iteracije traži se sljedeće rješenje
+
+
+def row_major(state, depth):
+    """
+    Izbor polja red po red: prvo prazno polje iz state.empties. Na dubini depth je prvih depth praznih polja sigurno
+    popunjeno (svaki nivo bira polje iza polja prethodnog nivoa), pa pretraga kreće od depth.
+    """
+    values, empties = state.values, state.empties
+    for position in range(depth, len(empties)):
+        if not values[empties[position]]:
+            return empties[position]
+    return None
+
+
+def mrv(state, depth):
+    """
+    Izbor praznog polja sa najmanje živih kandidata (stanje mora biti kreirano sa mrv=True).
+    """
+    blank = state.select_cell()
+    if blank is None:
+        return None
+    return blank[0] * state.n + blank[1]
+
+
+def ascending(state, idx):
+    """
+    Živi kandidati ćelije idx u rastućem redoslijedu.
+    """
+    return mask_to_values(state.cands[idx])
+
+
+def steps(state, next_cell=mrv, try_values=ascending, propagate=False, counts=None, stop=None):
+    """
+    Iterativna pretraga sa eksplicitnim stekom: umjesto jednog Python okvira po popunjenom polju, stek čuva za svaki
+    nivo ćeliju, oznaku traga i iterator preostalih vrijednosti, pa dubina pretrage nije ograničena dubinom
+    rekurzije (i 25x25 ploče sa 625 praznih polja). Sve izmjene se poništavaju kroz trag stanja (mark/undo): ako
+    rješenje ne postoji ili je pretraga prekinuta, ploča je nakon iteracije ista kao prije, uključujući i polja koja je
+    popunila početna propagacija.
+
+    Pretraga je generator koji nakon svakog koraka vraća događaj (PLACE, REJECT, UNDO ili SOLVED), tako da se može
+    pauzirati i nastaviti u bilo kom trenutku (npr. GUI prikazuje korak po korak). Kod SOLVED je ploča riješena;
+    ako se iteracija nastavi, pretraga traži sljedeće rješenje, pa ista pretraga služi i za brojanje rješenja.
+
+    Args:
+        state (BoardState): Stanje ploče.
+        next_cell: Metoda (state, dubina) -> indeks praznog polja ili None ako praznih polja nema.
+        try_values: Metoda (state, indeks) -> vrijednosti koje se probaju, redom; poziva se lijeno, nakon što je
+         stanje vraćeno na trenutak grananja, pa može čitati žive kandidate.
+        propagate (bool): Da li se nakon svakog upisa (i na početku) primjenjuje propagation.propagate.
+        counts (dict|None): Brojač tehnika propagacije.
+        stop: Metoda bez argumenata koja se poziva u svakom čvoru; ako vrati True pretraga se prekida.
+
+    Returns:
+        Generator događaja (događaj, indeks, vrijednost).
+    """
+    root = state.mark()  # i početna propagacija se poništava ako rješenje ne postoji
+    if propagate and not propagation.propagate(state, counts):
+        state.undo(root)
+        return
+    idx = next_cell(state, 0)
+    if idx is None:
+        yield SOLVED, None, 0
+        state.undo(root)  # nastavak iteracije nakon rješenja: drugih rješenja nema
+        return
+    stack = [[idx, state.mark(), iter(try_values(state, idx)), 0]]  # ćelija, oznaka, vrijednosti, upisana vrijednost
+    while stack:
+        frame = stack[-1]
+        idx, mark, values, placed = frame
+        if placed:
+            state.undo(mark)
+            frame[3] = 0
+            yield UNDO, idx, placed
+        if stop is not None and stop():
+            state.undo(root)
+            return
+        value = next(values, 0)
+        if not value:
+            stack.pop()
+            continue
+
+        if not state.assign(idx, value) or (propagate and not propagation.propagate(state, counts)):
+            state.undo(mark)
+            yield REJECT, idx, value
+            continue
+        frame[3] = value
+        yield PLACE, idx, value
+        blank = next_cell(state, len(stack))
+        if blank is None:
+            yield SOLVED, idx, value
+            continue  # nastavak iteracije poništava posljednji upis i traži dalje
+        stack.append([blank, state.mark(), iter(try_values(state, blank)), 0])
+    state.undo(root)
+
+
+def run(state, next_cell=mrv, try_values=ascending, propagate=False, counts=None, stop=None, stats=None):
+    """
+    Pretraga do prvog rješenja; stanje (i ploča) ostaju riješeni ako rješenje postoji.
+
+    Args:
+        stats (SolveStats|None): Ako je zadat, u njega se upisuju broj upisa, odbačenih upisa i povrataka, najveća
+         dubina i vrijeme pretrage (ostali argumenti su isti kao kod steps).
+
+    Returns:
+        tuple[bool, int]: Da li je rješenje pronađeno i broj isprobanih vrijednosti.
+    """
+    if stats is not None:
+        return _run_with_stats(steps(state, next_cell, try_values, propagate, counts, stop), stats)
+    tries = 0
+    for event, _, _ in steps(state, next_cell, try_values, propagate, counts, stop):
+        if event is SOLVED:
+            return True, tries
+        if event is not UNDO:
+            tries += 1
+    return False, tries
+
+
+def _run_with_stats(events, stats):
+    """
+    Isto kao run, uz brojanje događaja u stats. Dubina je broj upisa koji još nisu poništeni: svaki UNDO poništava
+    tačno jedan raniji PLACE.
+    """
+    start_time = time.perf_counter()
+    placements = rejections = backtracks = depth = max_depth = 0
+    solved = False
+    for event, _, _ in events:
+        if event is PLACE:
+            placements += 1
+            depth += 1
+            if depth > max_depth:
+                max_depth = depth
+        elif event is UNDO:
+            backtracks += 1
+            depth -= 1
+        elif event is REJECT:
+            rejections += 1
+        else:
+            solved = True
+            break
+    stats.placements += placements
+    stats.rejections += rejections
+    stats.backtracks += backtracks
+    stats.max_depth = max(stats.max_depth, max_depth)
+    stats.search_time += time.perf_counter() - start_time
+    stats.solved = solved
+    return solved, placements + rejections
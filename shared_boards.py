@@ -0,0 +1,120 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+from flat_board import FlatBoard
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+import os
+
+# Blok dijeljene memorije za count ploča veličine size (n = size**2) ima četiri dijela, redom:
+#   zaglavlje: jedan bajt, 1 ako blok sadrži keš,
+#   keš redoslijeda vrijednosti: n bajtova po ćeliji, vrijednosti redom, ostatak nule (n**3 bajtova, ili 0 bez keša),
+#   oznake rezultata: jedan bajt po ploči (1 ako je ploča riješena),
+#   ploče: n * n bajtova po ploči, red po red, kao FlatBoard.
+# Radni procesi se na blok kače po imenu, pa između procesa putuju samo ime, indeksi i oznake rezultata.
+
+_attached = dict()  # ime bloka -> (SharedMemory, keš); radni proces drži otvoren samo posljednji blok
+
+
+def share_tracker():
+    """
+    Metoda koja pokreće resource_tracker prije kreiranja pool-a, tako da ga radni procesi nasljeđuju umjesto da
+    svaki pokrene svoj. Inače bi tracker radnog procesa pri gašenju prijavio blokove na koje se proces zakačio kao
+    "leaked" i pokušao da ih obriše.
+    """
+    if os.name == "posix":
+        resource_tracker.ensure_running()
+
+
+def _offsets(buf, size, count):
+    n = size**2
+    flags = 1 + (n**3 if buf[0] else 0)
+    return flags, flags + count, n * n
+
+
+def create_block(boards, size=3, cache=None):
+    """
+    Metoda za kreiranje bloka dijeljene memorije sa pločama boards i kešom cache. Bez keša se prostor za njega ne
+    rezerviše. Blok pripada pozivaocu, koji ga nakon upotrebe mora zatvoriti i obrisati (close/unlink).
+
+    Args:
+        boards (list): Lista ploča (lista listi ili FlatBoard).
+        size (int): Veličina ploča.
+        cache (dict|None): Keš sa redoslijedom dozvoljenih vrijednosti po ćeliji (row, col).
+
+    Returns:
+        SharedMemory: Blok dijeljene memorije.
+    """
+    n = size**2
+    header = bytes([cache is not None])
+    flags, start, cells = _offsets(header, size, len(boards))
+    shm = SharedMemory(create=True, size=start + len(boards) * cells)
+    buf = shm.buf
+    buf[:start] = bytes(start)
+    buf[0] = header[0]
+    for (row, col), values in (cache or {}).items():
+        offset = 1 + (row * n + col) * n
+        buf[offset:offset + len(values)] = bytes(values)
+    for index, board in enumerate(boards):
+        buf[start + index * cells:start + (index + 1) * cells] = FlatBoard(board, size).data
+    return shm
+
+
+def attach(name, size=3):
+    """
+    Metoda kojom se radni proces kači na blok po imenu. Blok i keš pročitan iz njega se pamte, pa se svi zadaci
+    istog poziva izvršavaju nad jednom mapiranom memorijom; pri prelasku na novi blok prethodni se zatvara.
+
+    Args:
+        name (str): Ime bloka.
+        size (int): Veličina ploča.
+
+    Returns:
+        tuple: (SharedMemory, keš kao dict (row, col) -> lista vrijednosti, ili None ako blok nema keš).
+
+    Raises:
+        FileNotFoundError: Ako je vlasnik bloka već obrisao blok (poziv je završen ili otkazan).
+    """
+    if name not in _attached:
+        for shm, _ in _attached.values():
+            shm.close()
+        _attached.clear()
+        shm = SharedMemory(name=name)
+        n = size**2
+        cache = None
+        if shm.buf[0]:
+            cache = dict()
+            raw = bytes(shm.buf[1:1 + n**3])
+            for idx in range(n * n):
+                values = [value for value in raw[idx * n:(idx + 1) * n] if value]
+                if values:
+                    cache[(idx // n, idx % n)] = values
+        _attached[name] = (shm, cache)
+    return _attached[name]
+
+
+def board_at(buf, size, count, index):
+    """
+    Metoda koja vraća ploču sa rednim brojem index kao FlatBoard direktno nad dijeljenom memorijom, bez kopiranja:
+    upis u ploču (npr. rješavanje na mjestu) je odmah vidljiv ostalim procesima.
+    """
+    _, start, cells = _offsets(buf, size, count)
+    return FlatBoard(buf[start + index * cells:start + (index + 1) * cells], size)
+
+
+def flags_view(buf, size, count):
+    """
+    Metoda koja vraća memoryview oznaka rezultata (jedan bajt po ploči).
+    """
+    flags, start, _ = _offsets(buf, size, count)
+    return buf[flags:start]
+
+
+def read_board(buf, size, count, index, board):
+    """
+    Metoda koja prepisuje ploču index iz bloka u ploču board (lista listi ili FlatBoard).
+    """
+    n = size**2
+    _, start, cells = _offsets(buf, size, count)
+    offset = start + index * cells
+    for row in range(n):
+        board[row] = list(buf[offset + row * n:offset + (row + 1) * n])
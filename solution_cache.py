@@ -0,0 +1,233 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+import optimized_backtracking as ob
+import sudokutools
+from collections import OrderedDict
+import random
+import sqlite3
+import sys
+import time
+
+
+def _line_signature(line, size, freq):
+    """
+    Potpis reda (ili kolone) koji se ne mijenja pri preimenovanju cifara i pri permutacijama u drugom smjeru: broj
+    popunjenih polja, sortirani brojevi popunjenih polja po blokovima, i sortirane frekvencije cifara tog reda na
+    cijeloj ploči.
+    """
+    blocks = sorted(sum(1 for value in line[b * size:(b + 1) * size] if value) for b in range(size))
+    return (sum(1 for value in line if value), tuple(blocks), tuple(sorted(freq[value] for value in line if value)))
+
+
+def _line_order(signatures, size):
+    """
+    Redoslijed redova (ili kolona) po potpisima: trake se sortiraju po sortiranim potpisima svojih redova, a redovi
+    unutar trake po svojim potpisima. Time se dobija permutacija koja čuva validnost ploče.
+    """
+    bands = sorted(range(size), key=lambda b: sorted(signatures[b * size:(b + 1) * size]))
+    order = []
+    for band in bands:
+        order.extend(sorted(range(band * size, (band + 1) * size), key=signatures.__getitem__))
+    return order
+
+
+def _canonical_orientation(grid, size):
+    n = size**2
+    freq = [0] * (n + 1)
+    for row in grid:
+        for value in row:
+            freq[value] += 1
+    rows = _line_order([_line_signature(grid[r], size, freq) for r in range(n)], size)
+    cols = _line_order([_line_signature([grid[r][c] for r in range(n)], size, freq) for c in range(n)], size)
+
+    labels = [0] * (n + 1)  # originalna cifra -> kanonska cifra, po redoslijedu prvog pojavljivanja
+    next_label = 1
+    flat = []
+    for r in rows:
+        row = grid[r]
+        for c in cols:
+            value = row[c]
+            if value and not labels[value]:
+                labels[value] = next_label
+                next_label += 1
+            flat.append(labels[value])
+    for value in range(1, n + 1):  # cifre kojih nema među datim poljima dobijaju preostale oznake
+        if not labels[value]:
+            labels[value] = next_label
+            next_label += 1
+    return bytes(flat), (rows, cols, labels)
+
+
+def canonical_form(board, size=3):
+    """
+    Metoda za kanonski oblik ploče: ploča se transformiše transformacijama koje čuvaju validnost (transpozicija,
+    permutacije traka i redova/kolona unutar traka, preimenovanje cifara) u oblik koji je isti za preimenovane i
+    simetrične varijante iste slagalice. Redoslijed redova i kolona se bira po potpisima koji ne zavise od tih
+    transformacija, a od dvije orijentacije (original i transponovana) bira se leksikografski manja. Kod ploča sa
+    jednakim potpisima kanonski oblik može zavisiti od polazne orijentacije, što samo znači promašaj keša, nikada
+    pogrešno rješenje, jer se transformacija uvijek pamti i tačno invertuje.
+
+    Args:
+        board (list[list[int]]): Reprezentacija ploce dimenzija size x size predstavljene kao lista listi
+         od int vrijednosti.
+        size (int): Veličina sudoku slagalice; podrazumijevana vrijednost je 3.
+
+    Returns:
+        tuple: Par (key, transform), gdje je key kanonska ploča kao bytes red po red, a transform opis transformacije
+        za apply_transform/invert_transform.
+    """
+    key, (rows, cols, labels) = _canonical_orientation(board, size)
+    transposed = [list(column) for column in zip(*board)]
+    key_t, (rows_t, cols_t, labels_t) = _canonical_orientation(transposed, size)
+    if key_t < key:
+        return key_t, (True, rows_t, cols_t, labels_t)
+    return key, (False, rows, cols, labels)
+
+
+def apply_transform(board, transform):
+    """
+    Metoda koja prevodi ploču iz orijentacije pozivaoca u kanonsku orijentaciju.
+    """
+    transposed, rows, cols, labels = transform
+    grid = [list(column) for column in zip(*board)] if transposed else board
+    return [[labels[grid[r][c]] for c in cols] for r in rows]
+
+
+def invert_transform(board, transform):
+    """
+    Metoda koja prevodi ploču (npr. kanonsko rješenje) iz kanonske orijentacije nazad u orijentaciju pozivaoca.
+    """
+    transposed, rows, cols, labels = transform
+    n = len(rows)
+    original = [0] * len(labels)
+    for value, label in enumerate(labels):
+        original[label] = value
+    grid = [[0] * n for _ in range(n)]
+    for i, r in enumerate(rows):
+        for j, c in enumerate(cols):
+            grid[r][c] = original[board[i][j]]
+    return [list(column) for column in zip(*grid)] if transposed else grid
+
+
+def _solve_canonical(board, size):
+    if ob.solve_with_cache(board, None, size, propagate=True):
+        return board
+    return None
+
+
+class SolutionCache:
+    def __init__(self, maxsize=4096, path=None, solver=_solve_canonical):
+        """
+        Keš rješenja po kanonskom obliku ploče, sa LRU izbacivanjem i opcionim trajnim slojem na disku (sqlite3).
+
+        Args:
+            maxsize (int): Najveći broj rješenja u memoriji.
+            path (str|None): Putanja do sqlite3 baze za trajni sloj; None bez trajnog sloja.
+            solver: Metoda (board, size) koja rješava ploču na mjestu i vraća riješenu ploču ili None.
+
+        Attributes:
+            hits (int): Broj pogodaka u memoriji.
+            disk_hits (int): Broj pogodaka u trajnom sloju.
+            misses (int): Broj promašaja (ploča je rješavana).
+            evictions (int): Broj rješenja izbačenih iz memorije.
+        """
+        self.maxsize = maxsize
+        self.solver = solver
+        self.entries = OrderedDict()  # kanonski ključ -> kanonsko rješenje (bytes) ili None
+        self.hits = self.disk_hits = self.misses = self.evictions = 0
+        self.db = None
+        if path is not None:
+            self.db = sqlite3.connect(path)
+            self.db.execute("CREATE TABLE IF NOT EXISTS solutions (key BLOB PRIMARY KEY, solution BLOB)")
+
+    def _remember(self, key, solution):
+        self.entries[key] = solution
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def _lookup(self, key):
+        """
+        Traženje kanonskog rješenja u memoriji pa na disku; vraća (pronađeno, rješenje).
+        """
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return True, self.entries[key]
+        if self.db is not None:
+            row = self.db.execute("SELECT solution FROM solutions WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self.disk_hits += 1
+                self._remember(key, row[0])
+                return True, row[0]
+        return False, None
+
+    def solve(self, board, size=3):
+        """
+        Metoda za rješavanje ploče preko keša. Ploča se svodi na kanonski oblik; ako je rješenje tog oblika već
+        poznato ono se vraća preslikano u orijentaciju pozivaoca, a u suprotnom se kanonska ploča rješava i pamti.
+        Ploča se popunjava na mjestu, kao kod solve_with_cache.
+
+        Args:
+            board (list[list[int]]): Ploča koju je potrebno riješiti.
+            size (int): Veličina ploče.
+
+        Returns:
+            bool: True ako slagalica ima rješenje, False u suprotnom.
+        """
+        n = size**2
+        key, transform = canonical_form(board, size)
+        found, solution = self._lookup(key)
+        if not found:
+            self.misses += 1
+            solved = self.solver(apply_transform(board, transform), size)
+            solution = bytes(value for row in solved for value in row) if solved is not None else None
+            self._remember(key, solution)
+            if self.db is not None:
+                self.db.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?)", (key, solution))
+                self.db.commit()
+        if solution is None:
+            return False
+        canonical = [list(solution[i * n:(i + 1) * n]) for i in range(n)]
+        for i, row in enumerate(invert_transform(canonical, transform)):
+            board[i] = row
+        return True
+
+    def stats(self):
+        """
+        Metoda koja vraća statistiku keša.
+
+        Returns:
+            dict: Broj pogodaka (u memoriji i na disku), promašaja, izbacivanja, trenutna veličina i udio pogodaka.
+        """
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.entries),
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else None,
+        }
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    rng = random.Random(0)
+    base = [sudokutools.generate_board(size, 2, rng=rng, unique=True) for _ in range(20)]
+    cache = SolutionCache()
+    start_time = time.time()
+    for _ in range(500):
+        board = [row[:] for row in rng.choice(base)]
+        if rng.random() < 0.5:
+            board = [list(column) for column in zip(*board)]
+        digits = list(range(1, size**2 + 1))
+        rng.shuffle(digits)
+        board = [[digits[value - 1] if value else 0 for value in row] for row in board]
+        cache.solve(board, size)
+    print(cache.stats(), "{:.2f} s".format(time.time() - start_time))
@@ -0,0 +1,178 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+from board_state import BoardState
+from flat_board import copy_board
+import propagation
+import search
+from collections import deque
+from functools import partial
+from multiprocessing import Pool
+import itertools
+import math
+
+
+def _count(state, limit, found, max_tries=math.inf):
+    """
+    Pretraga koja broji rješenja stanja state dok njihov broj ne dostigne limit. Pretraga (search.steps) ide preko
+    traga stanja (assign/undo), a nakon svakog pokušaja se radi propagacija, pa se ploča nikada ne kopira.
+
+    Args:
+        state (BoardState): Stanje ploče kreirano sa mrv=True.
+        limit (int|float): Broj rješenja nakon kojeg se pretraga prekida (math.inf za sva rješenja).
+        found (int): Broj do sada pronađenih rješenja.
+        max_tries (int|float): Najveći broj isprobanih vrijednosti; ako se pretraga prekine zbog njega, vraća se
+         limit, kao da su rješenja pronađena.
+
+    Returns:
+        int: Ukupan broj pronađenih rješenja (najviše limit).
+    """
+    tries = 0
+    for event, _, _ in search.steps(state, search.mrv, search.ascending, propagate=True):
+        if event is search.SOLVED:
+            found += 1
+            if found >= limit:
+                break
+        elif event is not search.UNDO:
+            tries += 1
+            if tries > max_tries:
+                return limit
+    return found
+
+
+def count_solutions(board, size=3, limit=2, processes=1):
+    """
+    Metoda za brojanje rješenja ploče board, sa ranim prekidom kada se pronađe limit rješenja. Sa limit=2 služi kao
+    brza provjera jedinstvenosti rješenja. Ploča ostaje nepromijenjena.
+
+    Za iscrpno brojanje na rijetko popunjenim pločama (npr. 16x16) može se zadati processes > 1: ploča se tada
+    dijeli na nezavisne podploče koje se broje u više procesa, a brojanje se prekida čim zbir dostigne limit.
+
+    Args:
+        board (list[list[int]]): Reprezentacija ploce dimenzija size x size predstavljene kao lista listi
+         od int vrijednosti.
+        size (int): Veličina sudoku slagalice; podrazumijevana vrijednost je 3.
+        limit (int|None): Najveći broj rješenja koji se traži; None za sva rješenja.
+        processes (int): Broj procesa za brojanje.
+
+    Returns:
+        int: Broj rješenja, najviše limit.
+    """
+    limit = math.inf if limit is None else limit
+    if processes > 1:
+        return _count_parallel(board, size, limit, processes)
+
+    state = BoardState(board, size, mrv=True)
+    if not state.consistent:
+        return 0
+    mark = state.mark()
+    found = _count(state, limit, 0)
+    state.undo(mark)
+    return found
+
+
+def _split(board, size, target):
+    """
+    Podjela ploče na nezavisne podploče za paralelno brojanje. Za razliku od optimized_backtracking.split_frontier,
+    ovdje se ništa ne smije izgubiti: podploče zajedno pokrivaju tačno sva rješenja, a ploče koje propagacija potpuno
+    riješi se odmah broje.
+
+    Returns:
+        tuple[int, list]: Broj rješenja pronađenih tokom podjele i lista podploča.
+    """
+    frontier = deque([copy_board(board)])
+    solved = 0
+    while frontier and len(frontier) < target:
+        current = frontier.popleft()
+        state = BoardState(current, size, mrv=True)
+        if not state.consistent or not propagation.propagate(state):
+            continue
+        blank = state.select_cell()
+        if not blank:
+            solved += 1
+            continue
+        idx = blank[0] * state.n + blank[1]
+        mark = state.mark()
+        mask = state.cands[idx]
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            state.assign(idx, bit.bit_length())
+            frontier.append(copy_board(current))
+            state.undo(mark)
+    return solved, list(frontier)
+
+
+def _count_parallel(board, size, limit, processes):
+    """
+    Paralelno brojanje rješenja: podploče iz _split se broje u processes procesa, rezultati se sabiraju redoslijedom
+    završavanja, i pool se gasi čim zbir dostigne limit.
+    """
+    found, boards = _split(board, size, 8 * processes)
+    if found >= limit or not boards:
+        return min(found, limit)
+    with Pool(processes=processes) as pool:
+        for count in pool.imap_unordered(partial(count_solutions, size=size, limit=limit), boards):
+            found += count
+            if found >= limit:
+                break  # izlazak iz with bloka prekida preostale procese
+    return min(found, limit)
+
+
+def _enumerate(state):
+    """
+    Generator svih rješenja stanja state; svako rješenje se vraća kao nova ploča iste reprezentacije, a stanje se nakon
+    svake grane vraća kroz trag.
+    """
+    for event, _, _ in search.steps(state, search.mrv, search.ascending, propagate=True):
+        if event is search.SOLVED:
+            yield copy_board(state.board)
+
+
+def iter_solutions(board, size=3, limit=None):
+    """
+    Generator koji lijeno vraća rješenja ploče board, jedno po jedno, najviše limit njih. Sljedeće rješenje se traži
+    tek kada se zatraži, pa se prekidanjem iteracije prekida i pretraga. Ploča ostaje nepromijenjena.
+
+    Args:
+        board (list[list[int]]): Reprezentacija ploce dimenzija size x size predstavljene kao lista listi
+         od int vrijednosti.
+        size (int): Veličina sudoku slagalice; podrazumijevana vrijednost je 3.
+        limit (int|None): Najveći broj rješenja; None za sva.
+
+    Returns:
+        Generator riješenih ploča (list[list[int]]).
+    """
+    work = copy_board(board)  # stanje radi na mjestu, a generator se može napustiti usred pretrage
+    state = BoardState(work, size, mrv=True)
+    if not state.consistent:
+        return
+    yield from itertools.islice(_enumerate(state), limit)  # nakon limit-og rješenja se pretraga ne nastavlja
+
+
+def is_unique_without(board, row, col, value, size=3, max_tries=math.inf):
+    """
+    Metoda koja provjerava da li slagalica board, koja ima jedinstveno rješenje u kojem je u ćeliji (row, col) broj
+    value, ostaje jedinstvena kada se ta ćelija isprazni. To važi ako i samo ako ne postoji rješenje sa nekom drugom
+    vrijednošću u toj ćeliji, pa je dovoljno tražiti jedno takvo rješenje umjesto brojanja do dva.
+
+    Args:
+        board (list[list[int]]): Ploča u kojoj je ćelija (row, col) već ispražnjena (0).
+        row (int): Indeks reda ispražnjene ćelije.
+        col (int): Indeks kolone ispražnjene ćelije.
+        value (int): Vrijednost koja je uklonjena iz ćelije.
+        size (int): Veličina sudoku slagalice; podrazumijevana vrijednost je 3.
+        max_tries (int|float): Najveći broj pokušaja u pretrazi; ako se jedinstvenost ne dokaže do tada, vraća se
+         False (ćelija ostaje popunjena, pa je odgovor uvijek na sigurnoj strani). Kod 25x25 i 36x36 ploča dokaz
+         jedinstvenosti za pojedine ćelije može trajati minutama.
+
+    Returns:
+        bool: True ako slagalica i bez te ćelije ima jedinstveno rješenje.
+    """
+    state = BoardState(board, size, mrv=True)
+    mark = state.mark()
+    if state.eliminate(row * state.n + col, 1 << (value - 1)) < 0:
+        state.undo(mark)
+        return True  # value je bila jedina mogućnost za tu ćeliju
+    unique = _count(state, 1, 0, max_tries) == 0
+    state.undo(mark)
+    return unique
@@ -0,0 +1,85 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+import propagation
+
+
+class SolveStats:
+    def __init__(self):
+        """
+        Statistika jednog rješavanja. Objekat se prosljeđuje rješavaču kao opcioni parametar stats i rješavač ga
+        popunjava; bez njega rješavači ništa ne mjere, pa isključena statistika ne košta ništa. Svako rješavanje ima
+        svoj objekat, pa se (za razliku od globalnog brojača) vrijednosti ne miješaju između poziva, niti i procesa.
+
+        Attributes:
+            placements (int): Broj upisa vrijednosti u pretrazi koji nisu odmah doveli do kontradikcije.
+            rejections (int): Broj upisa koji su odmah (ili nakon propagacije) doveli do kontradikcije.
+            backtracks (int): Broj poništenih upisa (povratak unazad).
+            max_depth (int): Najveći broj istovremeno upisanih vrijednosti na steku pretrage.
+            techniques (dict): Broj primjena svake tehnike propagacije (propagation.new_counts()).
+            candidate_time (float): Vrijeme u sekundama potrošeno na računanje kandidata (BoardState, keš).
+            search_time (float): Vrijeme u sekundama potrošeno u pretrazi (uključujući propagaciju tokom pretrage).
+            solved (bool): Da li je rješenje pronađeno.
+            workers (list[SolveStats]): Statistike pojedinačnih grana paralelnog rješavanja; zbir je već uključen u
+             brojače ovog objekta.
+        """
+        self.placements = 0
+        self.rejections = 0
+        self.backtracks = 0
+        self.max_depth = 0
+        self.techniques = propagation.new_counts()
+        self.candidate_time = 0.0
+        self.search_time = 0.0
+        self.solved = False
+        self.workers = []
+
+    @property
+    def tries(self):
+        """
+        Broj isprobanih vrijednosti (upisi i odbačeni upisi), isto što je ranije brojao broj_pokusaja.
+        """
+        return self.placements + self.rejections
+
+    def merge(self, other):
+        """
+        Metoda koja dodaje statistiku other (npr. jedne paralelne grane) ovoj statistici: brojači i vremena se
+        sabiraju, a za dubinu se uzima veća vrijednost.
+
+        Args:
+            other (SolveStats): Statistika koja se dodaje.
+
+        Returns:
+            SolveStats: Ovaj objekat.
+        """
+        self.placements += other.placements
+        self.rejections += other.rejections
+        self.backtracks += other.backtracks
+        self.max_depth = max(self.max_depth, other.max_depth)
+        for technique, count in other.techniques.items():
+            self.techniques[technique] = self.techniques.get(technique, 0) + count
+        self.candidate_time += other.candidate_time
+        self.search_time += other.search_time
+        self.solved = self.solved or other.solved
+        return self
+
+    def as_dict(self):
+        """
+        Metoda za pretvaranje statistike u rječnik (npr. za JSON izvještaj benchmark-a).
+        """
+        return {
+            "placements": self.placements,
+            "rejections": self.rejections,
+            "backtracks": self.backtracks,
+            "tries": self.tries,
+            "max_depth": self.max_depth,
+            "techniques": dict(self.techniques),
+            "candidate_time_s": self.candidate_time,
+            "search_time_s": self.search_time,
+            "solved": self.solved,
+            "workers": [worker.as_dict() for worker in self.workers],
+        }
+
+    def __repr__(self):
+        return ("SolveStats(placements={}, rejections={}, backtracks={}, max_depth={}, candidate_time={:.6f}, "
+                "search_time={:.6f}, solved={}, workers={})").format(
+            self.placements, self.rejections, self.backtracks, self.max_depth, self.candidate_time,
+            self.search_time, self.solved, len(self.workers))
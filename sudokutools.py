@@ -1,8 +1,23 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
-from random import randint, shuffle
+import random
 import time
+from board_state import BoardState
+import search
+import solution_counter
+import tracing
+
+# rječnik za odredjivanje broja praznih polja za svaku veličinu slagalice i težinu: [0] - laka, [1] - srednja,
+# [2] - teška (i [3] - ekspert za 16x16). Kod 25x25 i 36x36 gornje granice su ispod broja praznih polja na kojem
+# provjera jedinstvenosti postaje spora (oko polovine ploče).
+DIFFICULTY_BLANKS = {3: {0: (16, 31), 1: (31, 46), 2: (46, 61)},
+                     4: {0: (35, 60), 1: (60, 85), 2: (85, 110), 3: (110, 130)},
+                     5: {0: (150, 220), 1: (220, 280), 2: (280, 320)},
+                     6: {0: (260, 400), 1: (400, 500), 2: (500, 580)}}
+# Najveći broj pokušaja za provjeru da li se polje može isprazniti (solution_counter.is_unique_without); polje za
+# koje se jedinstvenost ne dokaže do tada ostaje popunjeno.
+UNIQUE_MAX_TRIES = 200
 
 
 def print_board(board, size=3):
@@ -29,7 +44,7 @@ def print_board(board, size=3):
                 board_string += "\n"
 
             if j == size**2-1 and (i + 1) % size == 0 and i + 1 != size**2:
-                board_string += "- - - - - - - - - - - \n"
+                board_string += "- " * (size**2 + size - 1) + "\n"
     print(board_string)
 
 
@@ -89,7 +104,7 @@ def valid(board, pos, num, size=3):
     return True
 
 
-def solve(board, size=3):
+def solve(board, size=3, stats=None):
     """
     Rješavanje sudoku slagalice primjenom backtracking algoritma
 
@@ -97,107 +112,148 @@ def solve(board, size=3):
         size (int): Veličina sudoku slagalice; podrazumijevana vrijednost je 3
         board (list[list[int]]):  Reprezentacija ploce dimenzija size x size predstavljene kao lista listi
          od int vrijednosti.
+        stats (SolveStats|None): Statistika rješavanja koja se popunjava; bez nje se ništa ne mjeri.
 
     Returns:
         bool: True ako slagalica ima rješenje, False u suprotnom.
     """
 
-    # print(size)
-    empty = find_empty(board, size)
-    # print(empty[0], empty[1])
-    if not empty:
-        return True     # ako nema praznih polja sudoku slagalica je riješena
+    start_time = time.perf_counter() if stats is not None else 0.0
+    state = BoardState(board, size)
+    if stats is not None:
+        stats.candidate_time += time.perf_counter() - start_time
+        stats.solved = False
+    if not state.consistent:
+        return False
+    # polja se popunjavaju red po red, vrijednosti rastuće; pretraga je iterativna pa nema ograničenja dubine
+    return search.run(state, search.row_major, search.ascending, stats=stats)[0]
 
-    # opseg u ovom formatu jer range ne obuhvata gornju granicu opsega
-    for nums in range(1, size**2 + 1):
 
-        if valid(board, empty, nums, size):
-            board[empty[0]][empty[1]] = nums
+def _shuffled_lines(size, rng):
+    """
+    Metoda za slučajan redoslijed redova (ili kolona) koji čuva validnost ploče: permutuju se trake (band/stack),
+    a unutar svake trake i redovi same trake.
 
-            if solve(board, size):  # rekurzivni korak
-                return True
-            board[empty[0]][empty[1]] = 0  # broj je pogrešan pa se vraća na vrijednost 0 (0 predstavlja empty)
-    return False
+    Args:
+        size (int): Veličina sudoku slagalice.
+        rng (random.Random): Generator slučajnih brojeva.
+
+    Returns:
+        list[int]: Permutacija indeksa 0..size**2-1.
+    """
+    bands = list(range(size))
+    rng.shuffle(bands)
+    order = []
+    for band in bands:
+        inner = list(range(size))
+        rng.shuffle(inner)
+        order.extend(band * size + i for i in inner)
+    return order
 
 
-def generate_board(size=3, difficulty=0):
+def generate_solution(size=3, rng=None):
     """
-    Metoda za generisanje proizvoljnih sudoku slagalica sa različitim brojem praznih polja. Broj praznih polja određuje
-    težinu sudoku slagalice.
+    Metoda za generisanje potpuno popunjene validne sudoku ploče bez backtracking-a. Polazi se od kanonske ploče
+    (size*(r%size) + r//size + c) % size**2 + 1, koja je validna po konstrukciji, a zatim se primjenjuju transformacije
+    koje čuvaju validnost: preimenovanje cifara, permutacije redova unutar traka, permutacije traka, isto za kolone,
+    i transpozicija. Ploča se gradi u jednom prolazu, pa je generisanje i za 16x16 reda mikrosekundi.
+
+    Args:
+        size (int): Veličina sudoku slagalice; podrazumijevana vrijednost je 3.
+        rng (random.Random|int|None): Generator slučajnih brojeva ili seed; za isti seed uvijek se dobija ista ploča.
+         Podrazumijevano se koristi globalni generator modula random.
+
+    Returns:
+        list[list[int]]: Popunjena ploča dimenzija size**2 x size**2.
+    """
+    if rng is None:
+        rng = random
+    elif isinstance(rng, int):
+        rng = random.Random(rng)
+    n = size**2
+
+    digits = list(range(1, n + 1))
+    rng.shuffle(digits)  # digits[k] je nova oznaka za kanonsku vrijednost k + 1
+    rows = _shuffled_lines(size, rng)
+    cols = _shuffled_lines(size, rng)
+    board = [[digits[(size * (r % size) + r // size + c) % n] for c in cols] for r in rows]
+    if rng.random() < 0.5:
+        board = [list(column) for column in zip(*board)]
+    return board
 
-    :param int size: Veličina ploče. Podrazumijevana vrijednost je 3.
-    :param int difficulty: Težina slagalice [0] - laka, [1] - srednja, [2] - teška
+
+def generate_board(size=3, difficulty=0, rng=None, unique=False):
+    """
+    Metoda za generisanje proizvoljnih sudoku slagalica sa različitim brojem praznih polja. Broj praznih polja određuje
+    težinu sudoku slagalice. Sa unique=True polje se prazni samo ako slagalica i nakon toga ima jedinstveno rješenje,
+    pa se korisnikov unos može porediti sa jedinim mogućim rješenjem; ako se traženi broj praznih polja ne može
+    postići bez gubitka jedinstvenosti, slagalica ostaje sa manje praznih polja.
+
+    :param int size: Veličina ploče (3 do 6). Podrazumijevana vrijednost je 3.
+    :param int difficulty: Težina slagalice [0] - laka, [1] - srednja, [2] - teška; opsezi su u DIFFICULTY_BLANKS
+    :param random.Random rng: Generator slučajnih brojeva ili int seed; za isti seed daje istu slagalicu.
+    Podrazumijevano se koristi globalni generator modula random.
+    :param bool unique: Da li slagalica mora imati jedinstveno rješenje.
     :returns: Sudoku slagalicu dimenzija size x size.
     """
+    if rng is None:
+        rng = random
+    elif isinstance(rng, int):
+        rng = random.Random(rng)
+
+    blank_range = DIFFICULTY_BLANKS[size][difficulty]
+    with tracing.span("generate_board", size=size, difficulty=difficulty, unique=unique) as trace:
+        with tracing.span("generate_solution"):
+            board = generate_solution(size, rng)  # potpuno popunjena ploča koja se zatim prazni
+        with tracing.span("remove_cells"):
+            if unique:
+                checks = _remove_unique(board, size, rng.randint(*blank_range), rng)
+            else:
+                checks = 0
+                _remove_random(board, size, blank_range, rng)
+        if trace:
+            trace.counter("generate_board", blanks=sum(1 for row in board for value in row if not value),
+                          uniqueness_checks=checks)
+    return board
 
-    board = [[0 for i in range(size**2)] for j in range(size**2)]  # ploča se prvobitno ispuni nulama
-
-    # Popunjavanje dijagonalnih blokova
-    for i in range(0, size**2, size):
-        nums = list(range(1, size**2+1))
-        shuffle(nums)
-        for row in range(size):
-            for col in range(size):
-                board[i + row][i + col] = nums.pop()
-
-    # Popunjavanje ostatka polja korišćenjem backtracking algoritma
-    def fill_cells(board, row, col):
-        """
-        Metoda za popunjavanje ostatka polja korišćenjem backtracking algoritma.Popunjavanje dijagonalnih blokova prvo
-        smanjuje kompleksnost jer su ovi blokovi nezavisni od ostatka ploče.
-        Backtracking se koristi jer je efikasan za rešavanje problema kao što je Sudoku jer sistematski istražuje sve
-        moguće kombinacije i vraća se unazad kada naiđe na nevalidnu kombinaciju.
-        Args:
-            board (list[list[int]]): Ploča koja se popunjava.
-            row (int): Indeks trenutnog reda koji se popunjava.
-            col (int): Indeks trenutne kolone koja se popunjava.
-        Returns:
-            bool: True ako su preostale ćelije pravilno popunjene, False u suprotnom.
-        """
-
-        if row == size**2:
-            return True
-        if col == size**2:   # pređi u sljedeći red ako smo došli do kraja ploče po kolonama
-            return fill_cells(board, row + 1, 0)
-
-        if board[row][col] != 0:  # pređi na sljedeću kolonu ako je polje već popunjeno
-            return fill_cells(board, row, col + 1)
-
-        for num in range(1, size**2+1):
-            if valid(board, (row, col), num, size):
-                board[row][col] = num
-
-                if fill_cells(board, row, col + 1):  # rekurzija
-                    return True
 
-        board[row][col] = 0
-        return False
+def _remove_unique(board, size, blanks, rng):
+    """
+    Pražnjenje do blanks polja slučajnim redoslijedom, uz čuvanje jedinstvenosti rješenja. Svaka provjera gradi novo
+    BoardState stanje: pražnjenje polja ide suprotno od traga (undo poništava samo posljednje upise), a izgradnja
+    stanja je jeftina (cijelo generisanje 25x25 ploče traje oko 0.1 s).
 
-    fill_cells(board, 0, 0)
+    Returns:
+        int: Broj provjera jedinstvenosti.
+    """
+    cells = [(row, col) for row in range(size**2) for col in range(size**2)]
+    rng.shuffle(cells)
+    checks = 0
+    for row, col in cells:
+        if blanks == 0:
+            break
+        value = board[row][col]
+        board[row][col] = 0
+        checks += 1
+        if solution_counter.is_unique_without(board, row, col, value, size, UNIQUE_MAX_TRIES):
+            blanks -= 1
+        else:
+            board[row][col] = value  # bez ovog polja slagalica bi imala više rješenja
+    return checks
 
-    # rječnici za odredjivanje broja praznih polja za svaku težinu i veličinu slagalice
-    difficulty_dict3 = {0: (16, 31),  # easy
-                        1: (31, 46),  # medium
-                        2: (46, 61)}  # hard
 
-    difficulty_dict4 = {0: (35, 60),  # easy
-                        1: (60, 85),  # medium
-                        2: (85, 110),  # hard
-                        3: (110, 130)}  # expert
+def _remove_random(board, size, blank_range, rng):
+    """
+    Pražnjenje slučajnih polja bez provjere jedinstvenosti.
+    """
     distinct_rows_cols = set()
-    # print((randint(difficulty_dict3[difficulty][0], difficulty_dict3[difficulty][1])))
-    # print(difficulty_dict4[difficulty][0])
-    while len(distinct_rows_cols) < ((randint(difficulty_dict4[difficulty][0], difficulty_dict4[difficulty][1]))
-    if size == 4 else ((randint(difficulty_dict3[difficulty][0], difficulty_dict3[difficulty][1])) if size == 3
-    else ())):
-        row, col = randint(0, size ** 2 - 1), randint(0, size ** 2 - 1)
+    while len(distinct_rows_cols) < rng.randint(*blank_range):
+        row, col = rng.randint(0, size ** 2 - 1), rng.randint(0, size ** 2 - 1)
         if (row, col) not in distinct_rows_cols:
             board[row][col] = 0
 
         distinct_rows_cols.add((row, col))
 
-    return board
-
 
 if __name__ == "__main__":
     start_time = time.time()
@@ -0,0 +1,25 @@
+import batch_solver
+import puzzle_io
+import sudokutools
+from test_search import UNSOLVABLE
+
+
+def _boards():
+    boards = [sudokutools.generate_board(3, 2, rng=seed) for seed in range(3)]
+    boards.insert(1, puzzle_io.parse_puzzle(UNSOLVABLE[0]))
+    return boards
+
+
+def test_single_process_and_shared_memory_modes_agree():
+    results = {}
+    for processes in (1, 2):
+        boards = _boards()
+        originals = [[row[:] for row in board] for board in boards]
+        solutions = list(batch_solver.solve_batch(boards, 3, processes=processes, chunksize=2))
+        assert solutions[1] is None
+        assert boards[1] == originals[1]  # ploča bez rješenja ostaje ista
+        for board, solution in zip(boards, solutions):
+            if solution is not None:
+                assert solution is board and sudokutools.find_empty(board) is None
+        results[processes] = boards
+    assert results[1] == results[2]
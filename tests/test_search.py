@@ -0,0 +1,30 @@
+import optimized_backtracking as ob
+import puzzle_io
+from board_state import BoardState
+import search
+from solve_stats import SolveStats
+
+# Konzistentne 9x9 slagalice bez rješenja kod kojih početna propagacija popunjava polja prije neuspjeha.
+UNSOLVABLE = [
+    ".7.4.16......23..7.369.74....58.42767.2.1..3..4.27651..21.45...683.9214..5.368...",
+    "..34.72..162..9.....51263.9..4........8...1.6..19.24.7..7..49.....2..783.1....6.5",
+    "72..459185.38..627.19.....315....27.672...1.9......53...8....4..6..3..9143.18....",
+]
+
+
+def test_failed_propagate_solve_restores_board():
+    for text in UNSOLVABLE:
+        board = puzzle_io.parse_puzzle(text)
+        assert BoardState(board, 3).consistent
+        for stats in (None, SolveStats()):
+            work = [row[:] for row in board]
+            assert not ob.solve_with_cache(work, None, 3, propagate=True, stats=stats)
+            assert work == board
+
+
+def test_exhausted_steps_restore_board():
+    board = puzzle_io.parse_puzzle(UNSOLVABLE[0])
+    work = [row[:] for row in board]
+    events = list(search.steps(BoardState(work, 3, mrv=True), propagate=True))
+    assert search.SOLVED not in [event for event, _, _ in events]
+    assert work == board
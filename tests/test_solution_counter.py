@@ -0,0 +1,30 @@
+import search
+import solution_counter
+
+
+def _record_steps(monkeypatch):
+    events = []
+    steps = search.steps
+
+    def recording(*args, **kwargs):
+        for step in steps(*args, **kwargs):
+            events.append(step[0])
+            yield step
+
+    monkeypatch.setattr(search, "steps", recording)
+    return events
+
+
+def test_iter_solutions_stops_at_limit(monkeypatch):
+    events = _record_steps(monkeypatch)
+    board = [[0] * 9 for _ in range(9)]
+    solutions = list(solution_counter.iter_solutions(board, 3, limit=1))
+    assert len(solutions) == 1
+    assert events.count(search.SOLVED) == 1 and events[-1] is search.SOLVED  # pretraga staje na prvom rješenju
+    assert board == [[0] * 9 for _ in range(9)]
+
+
+def test_iter_solutions_zero_limit_does_not_search(monkeypatch):
+    events = _record_steps(monkeypatch)
+    assert list(solution_counter.iter_solutions([[0] * 9 for _ in range(9)], 3, limit=0)) == []
+    assert events == []
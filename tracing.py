@@ -0,0 +1,198 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Opciono praćenje (tracing) faza rješavanja u formatu Chrome trace-event JSON, koji se otvara u chrome://tracing,
+# Perfetto UI ili speedscope (flamegraph). Praćenje je podrazumijevano isključeno; uključuje se pozivom enable() ili
+# promjenljivom okruženja SUDOKU_TRACE=putanja.json (uz SUDOKU_TRACE_SAMPLE=udio), kada se događaji upisuju u fajl
+# pri izlasku iz programa. Događaji se bilježe po procesu: radni procesi pool-a imaju svoje (neupisane) događaje.
+import atexit
+import json
+import os
+import random
+import threading
+import time
+
+_enabled = False
+_sample_rate = 1.0
+_rng = random.Random()
+_events = []
+_local = threading.local()  # dubina otvorenih span-ova i odluka o uzorkovanju, posebno za svaku nit
+
+
+class _NullSpan:
+    """
+    Span koji ništa ne bilježi; vraća se kada je praćenje isključeno ili poziv nije uzorkovan.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __bool__(self):
+        return False
+
+    def counter(self, name, **values):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _UnsampledSpan(_NullSpan):
+    """
+    Span nepraćenog poziva: ne bilježi ništa, ali vodi dubinu kako bi i ugniježđeni span-ovi ostali nepraćeni.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        _local.depth = getattr(_local, "depth", 0) + 1
+        return self
+
+    def __exit__(self, *exc):
+        _local.depth -= 1
+        return False
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self):
+        _local.depth = getattr(_local, "depth", 0) + 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        _local.depth -= 1
+        event = {"name": self.name, "ph": "X", "ts": self.start * 1e6, "dur": (end - self.start) * 1e6,
+                 "pid": os.getpid(), "tid": threading.get_ident()}
+        if self.args:
+            event["args"] = self.args
+        _events.append(event)
+        return False
+
+    def __bool__(self):
+        return True
+
+    def counter(self, name, **values):
+        """
+        Bilježenje brojača (npr. broj pokušaja ili popunjenih polja) u okviru ovog span-a.
+        """
+        counter(name, **values)
+
+
+def enable(sample_rate=1.0, seed=None):
+    """
+    Metoda za uključivanje praćenja.
+
+    Args:
+        sample_rate (float): Udio poziva najvišeg nivoa koji se prate (0.01 prati svaki stoti); span-ovi unutar
+         praćenog poziva se uvijek prate, a unutar nepraćenog nikada, pa je svaki zabilježeni poziv potpun.
+        seed (int|None): Seed generatora za uzorkovanje, za ponovljive izbore.
+    """
+    global _enabled, _sample_rate
+    _enabled = True
+    _sample_rate = sample_rate
+    if seed is not None:
+        _rng.seed(seed)
+
+
+def disable():
+    """
+    Metoda za isključivanje praćenja; već zabilježeni događaji ostaju do poziva clear().
+    """
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def _sampled():
+    """
+    Da li se trenutni poziv prati: na najvišem nivou se odluka donosi slučajno, a ugniježđeni pozivi je nasljeđuju.
+    """
+    if not getattr(_local, "depth", 0):
+        _local.sampled = _sample_rate >= 1.0 or _rng.random() < _sample_rate
+    return _local.sampled
+
+
+def span(name, **args):
+    """
+    Metoda koja vraća context manager za mjerenje trajanja jednog dijela koda (događaj "X" u trace-event formatu).
+    Kada praćenje nije uključeno ili poziv nije uzorkovan vraća se span koji ništa ne radi i koji je False, pa se
+    skuplja dodatna statistika samo za praćene pozive:
+
+        with tracing.span("search", size=size) as trace:
+            if trace:
+                ...
+
+    Args:
+        name (str): Naziv span-a (prikazuje se u flamegraph-u).
+        **args: Dodatni podaci span-a (npr. veličina ploče).
+
+    Returns:
+        Context manager.
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    if not _sampled():
+        return _UnsampledSpan()
+    return _Span(name, args)
+
+
+def counter(name, **values):
+    """
+    Metoda za bilježenje vrijednosti brojača (događaj "C"), npr. broja pokušaja ili primjena tehnika jedne faze.
+    Brojač se bilježi samo u praćenom pozivu.
+
+    Args:
+        name (str): Naziv brojača.
+        **values: Nazivi i vrijednosti serija brojača.
+    """
+    if not _enabled or not getattr(_local, "depth", 0) or not _local.sampled:
+        return
+    _events.append({"name": name, "ph": "C", "ts": time.perf_counter() * 1e6, "pid": os.getpid(),
+                    "tid": threading.get_ident(), "args": values})
+
+
+def events():
+    """
+    Lista do sada zabilježenih događaja.
+    """
+    return list(_events)
+
+
+def clear():
+    """
+    Metoda za brisanje zabilježenih događaja.
+    """
+    del _events[:]
+
+
+def dump(path):
+    """
+    Metoda za upis zabilježenih događaja u fajl u Chrome trace-event JSON formatu.
+
+    Args:
+        path (str): Putanja izlaznog fajla.
+
+    Returns:
+        int: Broj upisanih događaja.
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"traceEvents": _events, "displayTimeUnit": "ms"}, file)
+    return len(_events)
+
+
+if os.environ.get("SUDOKU_TRACE"):
+    enable(float(os.environ.get("SUDOKU_TRACE_SAMPLE", "1.0")))
+    atexit.register(lambda: dump(os.environ["SUDOKU_TRACE"]))